@@ -5,6 +5,15 @@ import os
 
 from dotenv import load_dotenv
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
+
+# orjson необязателен: если установлен, ответы сериализуются им (в разы быстрее stdlib json)
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    DefaultResponse = JSONResponse
 
 from src.api import api_router
 
@@ -12,7 +21,9 @@ load_dotenv()
 
 import uvicorn
 
-app = FastAPI()
+app = FastAPI(default_response_class=DefaultResponse)
+# JSON-списки (статьи, дерево категорий) сжимаются в разы; мелкие ответы не трогаем
+app.add_middleware(GZipMiddleware, minimum_size=1000)
 app.include_router(api_router, prefix="/api")
 
 if __name__ == "__main__":
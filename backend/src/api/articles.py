@@ -3,14 +3,14 @@
 from typing import Generator, List, Optional
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from pydantic import BaseModel
 from sqlmodel import Session
 
 from src.database import db
-from src.models import Article
 from src.repositories.article_repository import ArticleRepository
 from src.api.auth import get_current_user  # dependency
+from src.utils import etag_json_response
 
 router = APIRouter(prefix="/articles", tags=["articles"])
 
@@ -41,6 +41,9 @@ class ArticleUpdate(BaseModel):
     content: Optional[str] = None
     content_type: Optional[str] = None
 
+class ArticleBatch(BaseModel):
+    ids: List[int]
+
 class ArticleImport(BaseModel):
     category_id: int
     title: str
@@ -51,14 +54,24 @@ class ArticleImport(BaseModel):
 
 @router.get("/", response_model=List[ArticleRead])
 def list_articles(
+    request: Request,
+    has_media: Optional[bool] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    offset: int = Query(0, ge=0),
     session: Session = Depends(get_db),
     current_user = Depends(get_current_user),
 ):
     """
-    Список всех статей.
+    Список статей; без параметров — все статьи.
+    has_media фильтрует по наличию медиа на стороне БД, limit/offset — постраничная выдача.
+    Отдаёт ETag; если клиент прислал совпадающий If-None-Match, возвращает 304 без тела.
     """
     repo = ArticleRepository(session)
-    return repo.ListAllArticles()
+    articles = [
+        ArticleRead.model_validate(a, from_attributes=True).model_dump(mode="json")
+        for a in repo.ListAllArticles(has_media=has_media, limit=limit, offset=offset)
+    ]
+    return etag_json_response(request, articles)
 
 @router.get("/{article_id}", response_model=ArticleRead)
 def get_article(
@@ -75,6 +88,19 @@ def get_article(
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Article not found")
     return article
 
+@router.post("/batch", response_model=List[ArticleRead])
+def get_articles_batch(
+    payload: ArticleBatch,
+    session: Session =  Depends(get_db),
+    current_user = Depends(get_current_user),
+):
+    """
+    Получить несколько статей по списку ID одним запросом.
+    Несуществующие ID пропускаются.
+    """
+    repo = ArticleRepository(session)
+    return repo.ListArticlesByIds(payload.ids)
+
 @router.get("/category/{category_id}", response_model=List[ArticleRead])
 def list_by_category(
     category_id: int,
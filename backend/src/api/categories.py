@@ -1,7 +1,7 @@
 ﻿# /src/api/categories.py
 
 from typing import Generator, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel
 from sqlmodel import Session
 
@@ -9,6 +9,7 @@ from src.database import db
 from src.api.auth import get_current_user
 from src.models import Category
 from src.repositories.category_repository import CategoryRepository
+from src.utils import etag_json_response
 
 router = APIRouter(prefix="/categories", tags=["categories"])
 
@@ -64,16 +65,18 @@ def list_categories(
 
 @router.get("/tree", response_model=List[CategoryTreeNode])
 def get_category_tree(
+    request: Request,
     db: Session =  Depends(get_db),
     current_user = Depends(get_current_user),
 ):
     """
     Дерево категорий (вложенность).
+    Отдаёт ETag; если клиент прислал совпадающий If-None-Match, возвращает 304 без тела.
     """
     repository = CategoryRepository(db)
     tree = repository.GetCategoryTree()
     # дерево уже в виде списка словарей {id,title,children}
-    return tree
+    return etag_json_response(request, tree)
 
 @router.get("/{category_id}", response_model=CategoryRead)
 def get_category(
@@ -1,12 +1,10 @@
 ﻿from typing import Generator, List, Optional
-from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
 from sqlmodel import Session
 
 from src.database import db
-from src.models import Media as MediaModel
 from src.repositories.media_repository import MediaRepository
 from src.api.auth import get_current_user
 
@@ -33,6 +31,9 @@ class MediaCreate(BaseModel):
     url: str
     sort_order: Optional[int] = 0
 
+class MediaBulkCreate(BaseModel):
+    items: List[MediaCreate]
+
 class MediaUpdate(BaseModel):
     media_type: Optional[str] = None
     url: Optional[str] = None
@@ -104,6 +105,19 @@ def create_media(
         sort_order=payload.sort_order,
     )
 
+@router.post("/bulk", response_model=List[MediaRead], status_code=status.HTTP_201_CREATED)
+def create_media_bulk(
+    payload: MediaBulkCreate,
+    session: Session =  Depends(get_db),
+    current_user = Depends(get_current_user),
+):
+    """Создать несколько медиаэлементов одним запросом."""
+    if current_user.role.name != "admin":
+        raise HTTPException(status.HTTP_403_FORBIDDEN, "Access denied")
+
+    repo = MediaRepository(session)
+    return repo.CreateMediaBulk([item.model_dump() for item in payload.items])
+
 @router.put("/{media_id}", response_model=MediaRead)
 def update_media(
     media_id: int,
@@ -201,6 +201,34 @@ def update_progress(
         logger.exception("Error updating progress")
         raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, "Internal server error")
 
+@router.put("/bulk", response_model=List[ProgressRead])
+def update_progress_bulk(
+    payload: List[ProgressUpdate],
+    session: Session = Depends(get_db),
+    current_user = Depends(get_current_user),
+):
+    """Обновить статусы нескольких записей прогресса одним запросом."""
+    logger.info(
+        "Bulk updating %d progress records by requester=%s",
+        len(payload), current_user.id
+    )
+
+    if current_user.role.name != "admin" and any(p.user_id != current_user.id for p in payload):
+        logger.warning(
+            "User %s forbidden to bulk update progress of other users",
+            current_user.id
+        )
+        raise HTTPException(status.HTTP_403_FORBIDDEN, "Access denied")
+
+    repo = ProgressRepository(session)
+    try:
+        updated = repo.UpdateProgressBulk([p.model_dump() for p in payload])
+        logger.info("Updated %d progress records", len(updated))
+        return updated
+    except Exception:
+        logger.exception("Error bulk updating progress")
+        raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, "Internal server error")
+
 @router.delete("/{progress_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_progress(
     progress_id: int,
@@ -1,15 +1,13 @@
 ﻿# /src/api/tests.py
 
-from typing import Generator, List, Optional
-from datetime import datetime
+from typing import Dict, Generator, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel, Field, field_validator, ValidationError, conlist, constr
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import BaseModel, Field, field_validator
 from sqlmodel import Session
 
 from src.database import db
 from src.models import Test as TestModel, Question as QuestionModel, AnswerOption as AnswerOptionModel
-from src.models import Test as TestModel
 from src.repositories.test_repository import TestRepository
 from src.repositories.question_repository import QuestionRepository
 from src.repositories.answer_option_repository import AnswerOptionRepository
@@ -44,6 +42,9 @@ class TestUpdate(BaseModel):
     title: Optional[str] = None
     max_attempts: Optional[int] = None
 
+class TestBatch(BaseModel):
+    ids: List[int]
+
 class TestImport(BaseModel):
     category_id: int
     title: str
@@ -134,6 +135,23 @@ def list_tests(
     repo = TestRepository(session)
     return repo.ListAllTests()
 
+# Объявлен до /{test_id}, иначе "by-categories" попадёт в test_id
+@router.get("/by-categories", response_model=Dict[int, List[TestRead]])
+def list_by_categories(
+    category_id: List[int] = Query(...),
+    session: Session =  Depends(get_db),
+    current_user = Depends(get_current_user),
+):
+    """
+    Тесты сразу для нескольких категорий (?category_id=1&category_id=2) одним SQL-запросом.
+    Возвращает словарь category_id -> список тестов; для каждой запрошенной категории есть ключ.
+    """
+    repo = TestRepository(session)
+    grouped: Dict[int, list] = {cid: [] for cid in category_id}
+    for test in repo.ListTestsByCategories(category_id):
+        grouped[test.category_id].append(test)
+    return grouped
+
 @router.get("/{test_id}", response_model=TestRead)
 def get_test(
     test_id: int,
@@ -147,6 +165,26 @@ def get_test(
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Test not found")
     return test
 
+@router.post("/batch", response_model=List[TestRead])
+def get_tests_batch(
+    payload: TestBatch,
+    session: Session =  Depends(get_db),
+    current_user = Depends(get_current_user),
+):
+    """Получить несколько тестов по списку ID. Несуществующие ID пропускаются."""
+    repo = TestRepository(session)
+    return repo.ListTestsByIds(payload.ids)
+
+@router.get("/{test_id}/options-flat", response_model=List[OptionRead])
+def list_options_flat(
+    test_id: int,
+    session: Session =  Depends(get_db),
+    current_user = Depends(get_current_user),
+):
+    """Все варианты ответов для всех вопросов теста плоским списком (одним запросом)."""
+    repo = AnswerOptionRepository(session)
+    return repo.ListOptionsByTest(test_id)
+
 @router.get("/category/{category_id}", response_model=List[TestRead])
 def list_by_category(
     category_id: int,
@@ -3,7 +3,7 @@ from typing import List, Optional, Dict, Any
 from sqlmodel import Session, select, delete, update
 from sqlalchemy.exc import SQLAlchemyError
 
-from src.models import AnswerOption
+from src.models import AnswerOption, Question
 
 class AnswerOptionRepository:
     def __init__(self, session: Session):
@@ -24,6 +24,16 @@ class AnswerOptionRepository:
         stmt = select(AnswerOption).where(AnswerOption.question_id == question_id)
         return self.session.exec(stmt).all()
 
+    def ListOptionsByTest(self, test_id: int) -> List[AnswerOption]:
+        """Возвращает все варианты ответов для всех вопросов теста одним запросом."""
+        stmt = (
+            select(AnswerOption)
+            .join(Question, AnswerOption.question_id == Question.id)
+            .where(Question.test_id == test_id)
+            .order_by(AnswerOption.question_id, AnswerOption.id)
+        )
+        return self.session.exec(stmt).all()
+
     def CreateOption(self, question_id: int, text: str, is_correct: bool = False) -> AnswerOption:
         """Создаёт новый вариант ответа для вопроса."""
         option = AnswerOption(question_id=question_id, text=text, is_correct=is_correct)
@@ -3,15 +3,29 @@ from typing import List, Optional, Dict, Any
 from sqlmodel import Session, select, delete, update
 from sqlalchemy.exc import SQLAlchemyError
 
-from src.models import Article
+from src.models import Article, Media
 
 class ArticleRepository:
     def __init__(self, session: Session):
         self.session = session
 
-    def ListAllArticles(self) -> List[Article]:
-        """Возвращает список всех статей."""
+    def ListAllArticles(
+        self,
+        has_media: Optional[bool] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[Article]:
+        """
+        Возвращает список статей.
+        has_media=True/False оставляет только статьи с медиа / без медиа;
+        limit и offset задают страницу (по возрастанию ID).
+        """
         stmt = select(Article)
+        if has_media is not None:
+            media_exists = select(Media.id).where(Media.article_id == Article.id).exists()
+            stmt = stmt.where(media_exists if has_media else ~media_exists)
+        if limit is not None or offset:
+            stmt = stmt.order_by(Article.id).offset(offset).limit(limit)
         return self.session.exec(stmt).all()
 
     def GetArticleById(self, article_id: int) -> Optional[Article]:
@@ -19,6 +33,11 @@ class ArticleRepository:
         stmt = select(Article).where(Article.id == article_id)
         return self.session.exec(stmt).first()
 
+    def ListArticlesByIds(self, article_ids: List[int]) -> List[Article]:
+        """Возвращает статьи с указанными ID одним запросом."""
+        stmt = select(Article).where(Article.id.in_(article_ids))
+        return self.session.exec(stmt).all()
+
     def ListArticlesByCategory(self, category_id: int) -> List[Article]:
         """Возвращает список статей для указанной категории."""
         stmt = select(Article).where(Article.category_id == category_id)
@@ -38,6 +38,23 @@ class MediaRepository:
         self.session.refresh(media)
         return media
 
+    def CreateMediaBulk(self, items: List[Dict[str, Any]]) -> List[Media]:
+        """Создаёт несколько медиаэлементов одной транзакцией."""
+        created = [
+            Media(
+                article_id=item["article_id"],
+                media_type=item["media_type"],
+                url=item["url"],
+                sort_order=item.get("sort_order") or 0
+            )
+            for item in items
+        ]
+        self.session.add_all(created)
+        self.session.commit()
+        for media in created:
+            self.session.refresh(media)
+        return created
+
     def UpdateMedia(self, media_id: int, data: Dict[str, Any]) -> Optional[Media]:
         """Обновляет поля медиаэлемента по переданному словарю data."""
         media = self.GetMediaById(media_id)
@@ -79,6 +79,35 @@ class ProgressRepository:
         self.session.refresh(progress)
         return progress
 
+    def UpdateProgressBulk(self, items: List[Dict[str, Any]]) -> List[Progress]:
+        """
+        Обновляет статусы сразу нескольких записей прогресса одним коммитом.
+        Каждый элемент items содержит user_id, article_id и status.
+        Возвращает только найденные и обновлённые записи.
+        """
+        if not items:
+            return []
+        stmt = select(Progress).where(
+            Progress.user_id.in_({i["user_id"] for i in items}) &
+            Progress.article_id.in_({i["article_id"] for i in items})
+        )
+        by_key = {(p.user_id, p.article_id): p for p in self.session.exec(stmt).all()}
+
+        now = datetime.now(timezone.utc)
+        updated: Dict[tuple, Progress] = {}
+        for item in items:
+            progress = by_key.get((item["user_id"], item["article_id"]))
+            if not progress:
+                continue
+            progress.status = item["status"]
+            progress.updated_at = now
+            self.session.add(progress)
+            updated[(progress.user_id, progress.article_id)] = progress
+        self.session.commit()
+        for p in updated.values():
+            self.session.refresh(p)
+        return list(updated.values())
+
     def DeleteProgress(self, progress_id: int) -> bool:
         """Удаляет запись прогресса по ID. Возвращает True при успехе."""
         try:
@@ -19,11 +19,21 @@ class TestRepository:
         stmt = select(Test).where(Test.id == test_id)
         return self.session.exec(stmt).first()
 
+    def ListTestsByIds(self, test_ids: List[int]) -> List[Test]:
+        """Возвращает тесты с указанными ID одним запросом."""
+        stmt = select(Test).where(Test.id.in_(test_ids))
+        return self.session.exec(stmt).all()
+
     def ListTestsByCategory(self, category_id: int) -> List[Test]:
         """Возвращает список тестов для заданной категории."""
         stmt = select(Test).where(Test.category_id == category_id)
         return self.session.exec(stmt).all()
 
+    def ListTestsByCategories(self, category_ids: List[int]) -> List[Test]:
+        """Возвращает тесты всех указанных категорий одним запросом."""
+        stmt = select(Test).where(Test.category_id.in_(category_ids))
+        return self.session.exec(stmt).all()
+
     def CreateTest(self, category_id: int, title: str, max_attempts: int = 3) -> Test:
         """Создаёт новый тест в указанной категории."""
         test = Test(category_id=category_id, title=title, max_attempts=max_attempts)
@@ -1 +1 @@
-﻿
\ No newline at end of file
+﻿from .utils import etag_json_response
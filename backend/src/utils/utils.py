@@ -1 +1,19 @@
-﻿
\ No newline at end of file
+﻿import hashlib
+import json
+from typing import Any
+
+from fastapi import Request, Response, status
+
+
+def etag_json_response(request: Request, data: Any, max_age: int = 30) -> Response:
+    """
+    JSON-ответ с ETag (md5 от тела) и Cache-Control.
+    Если клиент прислал совпадающий If-None-Match, возвращает 304 без тела.
+    data должен быть уже сериализуемым в JSON (dict/list/str/числа).
+    """
+    body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    etag = f'"{hashlib.md5(body).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={max_age}"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,6 +1,9 @@
 ﻿import os
 import sys
+import queue
 import asyncio
+import logging
+import logging.handlers
 
 import argparse
 import uvicorn
@@ -11,7 +14,7 @@ from PySide6.QtCore    import QTimer
 from qasync            import QEventLoop
 
 from src.webui         import app
-from src.qt            import MainWindow, API_BASE
+from src.qt            import MainWindow, API_BASE, API_UNIX_SOCKET
 from src.qt.styles     import STYLESHEET
 from src.rest_client   import AsyncApiClient
 
@@ -19,6 +22,24 @@ from src.rest_client   import AsyncApiClient
 __version__ = "1.0"
 __author__ = "Wiered"
 
+def setup_logging() -> logging.handlers.QueueListener:
+    """
+    Логи только кладутся в очередь, а форматирование и запись в stderr идут в
+    фоновом потоке QueueListener — event loop не блокируется на выводе.
+    """
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    # QueueHandler подставляет в запись уже отформатированный текст — форматируем один раз, в listener
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter("%(levelname)s: %(asctime)s %(name)s %(message)s")
+    )
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
+
 def run_qt():
     app = QApplication(sys.argv)
     app.setStyleSheet(STYLESHEET)
@@ -26,7 +47,7 @@ def run_qt():
     loop = QEventLoop(app)
     asyncio.set_event_loop(loop)
 
-    client = AsyncApiClient(base_url=API_BASE)
+    client = AsyncApiClient(base_url=API_BASE, unix_socket=API_UNIX_SOCKET)
     window = MainWindow(client)
     window.show()
 
@@ -68,9 +89,13 @@ def run_pytest():
 
 def main():
     """"""
-    run_qt()
-    # run_webui()
-    # run_pytest()
+    listener = setup_logging()
+    try:
+        run_qt()
+        # run_webui()
+        # run_pytest()
+    finally:
+        listener.stop()
 
 if __name__ == '__main__':
     main()
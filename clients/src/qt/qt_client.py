@@ -20,6 +20,8 @@ load_dotenv()
 
 SERVER_PORT = os.getenv('SERVER_PORT')
 API_BASE = f"http://127.0.0.1:{SERVER_PORT}/api"
+# Если сервер слушает Unix-сокет (uvicorn --uds), ходим к нему напрямую, минуя TCP
+API_UNIX_SOCKET = os.getenv('API_UNIX_SOCKET')
 
 
 class CustomTitleBar(QWidget):
@@ -157,19 +159,22 @@ class MainWindow(QMainWindow):
         self.main_page_widget.personal_btn.clicked.connect(self.on_personal)
         self.main_page_widget.admin_btn.clicked.connect(self.on_admin)
 
-        # ===== 3) АДМИН-ПАНЕЛЬ (index = 2) =====
-        self.admin_panel = AdminPanelWidget(self.client)
+        # ===== 3) АДМИН-ПАНЕЛЬ =====
+        # большинство пользователей её не открывает, поэтому будет создаваться
+        # при первом же нажатии на кнопку "Admin Panel" (см. on_admin)
+        self.admin_panel = None
 
-        # ===== 4) СТРАНИЦА ПЕРСОНАЛЬНЫХ ДАННЫХ (index = 3) =====
+        # ===== 4) СТРАНИЦА ПЕРСОНАЛЬНЫХ ДАННЫХ (index = 2) =====
         self.personal_page = PersonalPageWidget(self.client)
 
-        # список текущих TestWidget-ов (чтобы потом удалять)
-        self.test_pages = []
+        # текущие TestWidget-ы по test_id: переиспользуются при повторном
+        # открытии теста; страница, которую не удалось загрузить, удаляется
+        # за O(1) через remove_test_page
+        self.test_pages: dict[int, TestWidget] = {}
 
         # Добавим все страницы в стек
         self.stacked.addWidget(self.login_page)
         self.stacked.addWidget(self.main_page_widget)
-        self.stacked.addWidget(self.admin_panel)
         self.stacked.addWidget(self.personal_page)
 
         # Сразу переключаемся на страницу логина
@@ -296,33 +301,39 @@ class MainWindow(QMainWindow):
     async def on_admin(self):
         """
         Вызывается при клике на кнопку "Admin Panel" в главном экране.
-        Просто переключаемся на виджет AdminPanel и запускаем загрузку данных.
+        При первом вызове создаёт AdminPanel, затем переключается на него
+        и запускает загрузку данных.
         """
+        if self.admin_panel is None:
+            self.admin_panel = AdminPanelWidget(self.client)
+            self.stacked.addWidget(self.admin_panel)
+
         # Переключаемся на страницу с админ‐панелью
         self.stacked.setCurrentWidget(self.admin_panel)
         # Запускаем начальную загрузку данных (категории, пользователи, тесты и т.д.)
         await self.admin_panel.load_all()
 
     def on_test(self, test_id: int):
-        test_window = TestWidget(self.client, test_id, self)
-        # Добавляем в stacked как новую страницу
-        self.stacked.addWidget(test_window)
-        self.test_pages.append(test_window)
-        # Инициируем асинхронную загрузку данных теста
+        test_window = self.test_pages.get(test_id)
+        if test_window is None:
+            test_window = TestWidget(self.client, test_id, self)
+            self.test_pages[test_id] = test_window
+            # Добавляем в stacked как новую страницу
+            self.stacked.addWidget(test_window)
+        else:
+            # Повторное прохождение — виджеты уже построены, сбрасываем только ответы
+            test_window.reset_answers()
+        # Инициируем асинхронную загрузку данных теста (если ещё не загружен)
         QTimer.singleShot(0, test_window.load_test)
-        # Переключаемся на страницу с тестом (последний индекс в стеке)
+        # Переключаемся на страницу с тестом
         self.stacked.setCurrentWidget(test_window)
 
     def remove_test_page(self, test_window: TestWidget):
         """
-        Удаляем данную страницу TestWidget из stacked и списка test_pages.
-        Вызывается после того, как тест был отправлен.
+        Удаляем данную страницу TestWidget из stacked и словаря test_pages.
         """
-        if test_window in self.test_pages:
-            idx = self.stacked.indexOf(test_window)
-            if idx != -1:
-                widget = self.stacked.widget(idx)
-                # Прежде чем удалять виджет, делаем его невидимым
-                self.stacked.removeWidget(widget)
-                widget.deleteLater()
-            self.test_pages.remove(test_window)
+        if self.test_pages.get(test_window.test_id) is not test_window:
+            return
+        del self.test_pages[test_window.test_id]
+        self.stacked.removeWidget(test_window)
+        test_window.deleteLater()
@@ -1,9 +1,14 @@
-﻿import os
+﻿import logging
+import os
+
+from PySide6.QtGui import QIcon, QPixmap
 
 base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 media_dir = os.path.join(base_dir, "media")
 svgs_dir = os.path.join(media_dir, "svgs")
 
+logger = logging.getLogger(__name__)
+
 class SVGManager:
     def __init__(self):
         self.icons = {}
@@ -12,7 +17,7 @@ class SVGManager:
         sys_path = os.path.join(svgs_dir, path).replace("\\", "/")
 
         if not os.path.exists(sys_path):
-            print(f"SVG-файл не найден: {self.icons[path]}")
+            logger.warning("SVG-файл не найден: %s", sys_path)
             return
 
         self.icons[path] = sys_path
@@ -21,6 +26,23 @@ class SVGManager:
         return self.icons.get(path)
 
 
+class MediaManager:
+    """
+    Кэш иконок для медиа статей: картинка читается с диска и декодируется
+    один раз, повторные показы той же картинки берут готовый QIcon.
+    """
+    def __init__(self):
+        self.icons = {}
+
+    def get_icon(self, path):
+        if path not in self.icons:
+            pixmap = QPixmap(os.path.join(media_dir, path))
+            # None тоже кэшируем, чтобы не дёргать диск для битых путей
+            self.icons[path] = QIcon(pixmap) if not pixmap.isNull() else None
+
+        return self.icons[path]
+
+
 icons_paths = [
     "done.svg",
     "maximize.svg",
@@ -34,3 +56,5 @@ svg_manager = SVGManager()
 
 for path in icons_paths:
     svg_manager.add_icon(path)
+
+media_manager = MediaManager()
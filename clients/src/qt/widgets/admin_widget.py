@@ -15,6 +15,9 @@ from src.rest_client import AsyncApiClient
 
 BUTTONS_HEIGHT = 50
 
+# Поддерживаемые расширения медиа -> media_type на сервере
+EXT_TO_MEDIA_TYPE = {".svg": "svg", ".png": "png", ".webm": "webm"}
+
 
 class AdminPanelWidget(QWidget):
     def __init__(self, client: AsyncApiClient):
@@ -565,50 +568,92 @@ class MediaDialog(QDialog):
         try:
             media_items = await self.client.list_media_by_article(self.article_id)
             for m in media_items:
-                item = QListWidgetItem(f"{m['id']}: {m['url']} ({m['media_type']})")
-                item.setData(Qt.UserRole, m)
-                self.media_list.addItem(item)
+                self._add_media_item(m)
         except Exception as e:
             QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить медиа:\n{e}")
 
+    def _add_media_item(self, m: dict):
+        """
+        Добавляет медиа в список, сохраняя порядок по sort_order
+        (как его возвращает сервер), без повторной загрузки списка.
+        """
+        item = QListWidgetItem(f"{m['id']}: {m['url']} ({m['media_type']})")
+        item.setData(Qt.UserRole, m)
+        row = self.media_list.count()
+        while row > 0 and self.media_list.item(row - 1).data(Qt.UserRole)["sort_order"] > m["sort_order"]:
+            row -= 1
+        self.media_list.insertItem(row, item)
+
     @Slot()
     def on_add_media(self):
         """
-        Добавление нового медиа: открывает QFileDialog для выбора файла,
-        определяет тип по расширению, загружает.
+        Добавление новых медиа: открывает QFileDialog для выбора одного или
+        нескольких файлов, определяет тип по расширению и загружает все
+        выбранные файлы одним запросом.
         """
-        file_path, _ = QFileDialog.getOpenFileName(
+        file_paths, _ = QFileDialog.getOpenFileNames(
             self, "Выберите медиа (SVG, PNG, WebM)", "", "Media files (*.svg *.png *.webm)"
         )
-        if not file_path:
+        if not file_paths:
             return
-        _, ext = os.path.splitext(file_path)
-        ext = ext.lower().lstrip(".")
-        if ext not in ("svg", "png", "webm"):
-            QMessageBox.warning(self, "Неподдерживаемый формат", "Выберите файл SVG, PNG или WebM")
+        # Медиа статьи уже загружены в список — повторно те же файлы не отправляем
+        existing = {
+            self.media_list.item(row).data(Qt.UserRole)["url"]
+            for row in range(self.media_list.count())
+        }
+        # Проверяем файлы локально до запроса: битые пропускаем, остальные загружаем
+        files, rejected, duplicates = [], [], []
+        for file_path in file_paths:
+            url = os.path.basename(file_path)
+            media_type = EXT_TO_MEDIA_TYPE.get(os.path.splitext(file_path)[1].lower())
+            if media_type is None or not os.path.isfile(file_path):
+                rejected.append(url)
+            elif url in existing:
+                duplicates.append(url)
+            else:
+                existing.add(url)
+                files.append((file_path, media_type))
+        if duplicates:
+            QMessageBox.information(
+                self, "Файлы пропущены",
+                "Уже есть у статьи:\n" + "\n".join(duplicates)
+            )
+        if rejected:
+            QMessageBox.warning(
+                self, "Файлы пропущены",
+                "Не найдены или не SVG/PNG/WebM:\n" + "\n".join(rejected)
+            )
+        if not files:
             return
-        # For simplicity, assume the server expects URL relative path.
-        # In real app, file should be uploaded to server; here we store filename only.
-        url = os.path.basename(file_path)
-        # Prompt for sort order
+        # Prompt for sort order (для нескольких файлов — порядок первого, дальше по возрастанию)
         sort_order, ok = QInputDialog.getInt(self, "Порядок сортировки", "Введите порядок:", 0, 0)
         if not ok:
             sort_order = 0
-        data = {
-            "article_id": self.article_id,
-            "media_type": ext,
-            "url": url,
-            "sort_order": sort_order
-        }
-        QTimer.singleShot(0, lambda: self._create_media(data))
-
-    @asyncSlot(dict)
-    async def _create_media(self, data: dict):
+        # For simplicity, assume the server expects URL relative path.
+        # In real app, file should be uploaded to server; here we store filename only.
+        items = [
+            {
+                "article_id": self.article_id,
+                "media_type": media_type,
+                "url": os.path.basename(file_path),
+                "sort_order": sort_order + i
+            }
+            for i, (file_path, media_type) in enumerate(files)
+        ]
+        QTimer.singleShot(0, lambda: self._create_media(items))
+
+    @asyncSlot(list)
+    async def _create_media(self, items: list):
         try:
-            await self.client.create_media(data)
-            await self.load_media()
+            # Сервер возвращает созданные записи — добавляем их сразу,
+            # не перезапрашивая весь список
+            for m in await self.client.create_media_bulk(items):
+                self._add_media_item(m)
         except Exception as e:
             QMessageBox.critical(self, "Ошибка", f"Не удалось добавить медиа:\n{e}")
+            # при поштучной загрузке часть файлов могла успеть создаться —
+            # перечитываем список, чтобы они не были отправлены повторно
+            QTimer.singleShot(0, lambda: self.load_media())
 
     @Slot()
     def on_delete_media(self):
@@ -629,7 +674,10 @@ class MediaDialog(QDialog):
     async def _delete_media(self, media_id: int):
         try:
             await self.client.delete_media(media_id)
-            await self.load_media()
+            for row in range(self.media_list.count()):
+                if self.media_list.item(row).data(Qt.UserRole)["id"] == media_id:
+                    self.media_list.takeItem(row)
+                    break
         except Exception as e:
             QMessageBox.critical(self, "Ошибка", f"Не удалось удалить медиа:\n{e}")
 
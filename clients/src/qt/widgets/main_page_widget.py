@@ -1,15 +1,22 @@
-﻿import os
+﻿import asyncio
+import logging
 
 import markdown
 from PySide6.QtCore import QSize, Qt
-from PySide6.QtGui import QIcon, QPixmap
+from PySide6.QtGui import QIcon
 from PySide6.QtWidgets import (QHBoxLayout, QLabel, QListWidget,
                                QListWidgetItem, QMessageBox, QPushButton,
                                QTextBrowser, QVBoxLayout, QWidget)
 from qasync import asyncSlot
 
 from src.qt.styles import STYLESHEET
-from src.qt.styles.icons import svg_manager
+from src.qt.styles.icons import media_manager, svg_manager
+
+logger = logging.getLogger(__name__)
+
+# Один экземпляр Markdown на модуль: расширения регистрируются один раз,
+# перед каждой конвертацией парсер только сбрасывается через reset()
+_MD = markdown.Markdown()
 
 class MainPageWidget(QWidget):
     def __init__(self, parent = None, client = None):
@@ -82,6 +89,11 @@ class MainPageWidget(QWidget):
         self.history = []
         self.current_id = None
 
+        # Предзагрузка первой статьи открытой категории, пока пользователь
+        # выбирает, что читать: article_id -> статья
+        self._prefetch_task = None
+        self._prefetch_cache = {}
+
          # Применяем стили
         self.list_widget.setStyleSheet(STYLESHEET)
         self.media_area.setStyleSheet(STYLESHEET)
@@ -99,7 +111,7 @@ class MainPageWidget(QWidget):
     @asyncSlot()
     async def _get_html_content(self, article):
         if article["content_type"] == "markdown":
-            html = markdown.markdown(article["content"])
+            html = _MD.reset().convert(article["content"])
         else:
             html = article["content"]
 
@@ -111,20 +123,15 @@ class MainPageWidget(QWidget):
         try:
             media = await self.client.list_media_by_article(article_id)
         except:
-            print("Ошибка при загрузке медиа")
+            logger.warning("Ошибка при загрузке медиа для статьи %s", article_id, exc_info=True)
             self.media_area.clear()
             return
 
         self.media_area.clear()
 
-        base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-        media_dir = os.path.join(base_dir, "media")
-
         for m in media:
-            image_path = os.path.join(media_dir, m["url"])
-            pixmap = QPixmap(image_path)
-            if not pixmap.isNull():
-                icon = QIcon(pixmap)
+            icon = media_manager.get_icon(m["url"])
+            if icon is not None:
                 item = QListWidgetItem(icon, "")
             else:
                 item = QListWidgetItem(m["url"])
@@ -136,7 +143,7 @@ class MainPageWidget(QWidget):
         user_id = me["id"]
 
         assigments = await self.client.list_assignments(user_id=user_id)
-        categories_ids = [c["category_id"] for c in assigments]
+        categories_ids = {c["category_id"] for c in assigments}
 
         all_categories = await self.client.list_categories()
         categories = [c for c in all_categories if c["id"] in categories_ids]
@@ -167,6 +174,8 @@ class MainPageWidget(QWidget):
                 item.setData(Qt.UserRole, {"type": "article", "id": art["id"]})
                 self.list_widget.addItem(item)
 
+            return arts
+
     @asyncSlot()
     async def _get_tests(self, parent_id):
         try:
@@ -177,7 +186,7 @@ class MainPageWidget(QWidget):
                 item.setData(Qt.UserRole, {"type": "test", "id": t["id"]})
                 self.list_widget.addItem(item)
         except Exception as e:
-            print(f"Ошибка при загрузке тестов: {e}")
+            logger.warning("Ошибка при загрузке тестов: %s", e)
 
     @asyncSlot(object)
     async def on_item(self, item: QListWidgetItem):
@@ -208,7 +217,7 @@ class MainPageWidget(QWidget):
         await self._get_categories(parent_id)
 
         # 2) Статьи (как было)
-        await self._get_articles(parent_id)
+        arts = await self._get_articles(parent_id)
 
         # 3) ** Добавляем проверку: есть ли у этой категории тесты? **
         if parent_id is not None:
@@ -216,10 +225,30 @@ class MainPageWidget(QWidget):
 
         self.back_btn.setEnabled(bool(self.history))
 
+        if arts:
+            self._prefetch_article(arts[0]["id"])
+
+    def _prefetch_article(self, article_id):
+        """
+        В фоне запрашивает статью, которую пользователь вероятнее всего откроет.
+        Предыдущая незавершённая предзагрузка отменяется.
+        """
+        if self._prefetch_task is not None:
+            self._prefetch_task.cancel()
+        self._prefetch_cache.clear()
+        self._prefetch_task = asyncio.ensure_future(self._prefetch(article_id))
+
+    async def _prefetch(self, article_id):
+        try:
+            self._prefetch_cache[article_id] = await self.client.get_article(article_id)
+        except Exception:
+            # Не угадали или сеть недоступна — load_article просто сходит за статьёй сам
+            pass
+
     @asyncSlot()
     async def load_article(self, article_id):
-        # Запрашиваем саму статью по ID
-        art = await self.client.get_article(article_id)
+        # Запрашиваем саму статью по ID (если она не была предзагружена)
+        art = self._prefetch_cache.pop(article_id, None) or await self.client.get_article(article_id)
 
         # Устанавливаем название статьи сверху
         self.title_label.setText(art.get("title", ""))
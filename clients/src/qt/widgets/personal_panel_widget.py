@@ -1,4 +1,6 @@
 ﻿import asyncio
+from itertools import chain
+
 from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
@@ -91,26 +93,11 @@ class PersonalPageWidget(QWidget):
         # 2) Список назначений для этого пользователя
         assignments = await self.client.list_assignments(user_id=self.user_id)
         category_ids = [a["category_id"] for a in assignments]
-        articles = []
-        for assignment in assignments:
-            articles_for_category = await self.client.list_articles_by_category(assignment["category_id"])
-            articles.extend(articles_for_category)
-
-        articles_ids = []
-        for article in articles:
-            articles_ids.append(article["id"])
+        # 3) Тесты всех назначенных категорий — одним запросом GET /tests/by-categories
+        tests_by_category = await self._list_tests_or_empty(category_ids)
 
-
-        # 3) Собираем все тесты из назначенных категорий
-        all_tests = []
-        for cid in category_ids:
-            try:
-                tests_in_cat = await self.client.list_tests_by_category(cid)
-            except Exception:
-                tests_in_cat = []
-            all_tests.extend(tests_in_cat)
-        total_tests = len(all_tests)
-        tests_ids_set = {t["id"] for t in all_tests}
+        total_tests = sum(len(tests) for tests in tests_by_category.values())
+        tests_ids_set = {t["id"] for t in chain.from_iterable(tests_by_category.values())}
 
         # 4) Получаем результаты тестов пользователя
         test_results = await self.client.list_test_results(user_id=self.user_id)
@@ -123,29 +110,42 @@ class PersonalPageWidget(QWidget):
         progresses = await self.client.list_progress(user_id=self.user_id)
         self.articles_list.clear()
         if progresses:
+            # Все статьи одним запросом POST /articles/batch
+            art_ids = list({p["article_id"] for p in progresses})
+            articles_by_id = {a["id"]: a for a in await self.client.get_articles(art_ids)}
             for article in progresses:
                 art_id = article.get("article_id")
-                article_obj = await self.client.get_article(art_id)
+                article_obj = articles_by_id.get(art_id)
+                title = article_obj["title"] if article_obj else f"#{art_id}"
                 status = article.get("status")
-                self.articles_list.addItem(f"Артикль {article_obj['title']}: {STATUS_DICT[status]}")
+                self.articles_list.addItem(f"Артикль {title}: {STATUS_DICT[status]}")
         else:
             self.articles_list.addItem("Нет прочтённых записей")
 
         # ===== Заполняем «Решённые тесты» – подробный список test results =====
         self.tests_list.clear()
         if test_results:
+            # Все тесты одним запросом POST /tests/batch
+            test_ids = list({tr["test_id"] for tr in test_results})
+            try:
+                tests_by_id = {t["id"]: t for t in await self.client.get_tests(test_ids)}
+            except Exception:
+                tests_by_id = {}
             for tr in test_results:
                 test_id = tr.get("test_id")
                 score = tr.get("score")
                 max_score = tr.get("max_score")
                 passed = tr.get("passed")
-                try:
-                    test_obj = await self.client.get_test(test_id)
-                    test_title = test_obj.get("title", f"Тест #{test_id}")
-                except Exception:
-                    test_title = f"Тест #{test_id}"
+                test_title = tests_by_id.get(test_id, {}).get("title", f"Тест #{test_id}")
 
                 status_text = "Пройден" if passed else "Не пройден"
                 self.tests_list.addItem(f"{test_title}: {score}/{max_score} ({status_text})")
         else:
             self.tests_list.addItem("Нет решённых тестов")
+
+    async def _list_tests_or_empty(self, category_ids):
+        """Тесты категорий (category_id -> список) или пустой словарь, если запрос не удался."""
+        try:
+            return await self.client.list_tests_by_categories(category_ids)
+        except Exception:
+            return {}
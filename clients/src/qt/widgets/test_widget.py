@@ -1,4 +1,6 @@
-﻿from PySide6.QtCore import Qt
+﻿import asyncio
+
+from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (QButtonGroup, QGroupBox, QHBoxLayout, QLabel,
                                QMainWindow, QMessageBox, QPushButton,
                                QRadioButton, QScrollArea, QVBoxLayout, QWidget)
@@ -24,6 +26,8 @@ class TestWidget(QWidget):
         self.questions = []       # список вопросов с вложенными опциями
         self.option_buttons = {}  # словарь question_id -> QButtonGroup
         self.max_score = 0
+        self._loading = False
+        self._loaded = False      # страница построена; тест без вопросов тоже считается загруженным
 
         # === Основной вертикальный layout: ===
         main_layout = QVBoxLayout(self)
@@ -74,55 +78,89 @@ class TestWidget(QWidget):
         Асинхронно вызывается сразу после создания TestWindow.
         Запрашивает GET /tests/full/{test_id}, парсит вопросы и варианты,
         динамически создаёт виджеты внутри self.vbox.
+        Повторные вызовы ничего не делают, если тест уже загружен.
         """
+        if self._loaded or self._loading:
+            return
+
+        self._loading = True
         try:
             test_data = await self.client.get_test_full(self.test_id)
         except Exception as e:
             QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить тест: {e}")
             self.parent_window.stacked.setCurrentIndex(1)
+            # пустую страницу не храним: при следующем открытии тест загрузится заново
+            self.parent_window.remove_test_page(self)
             return
+        finally:
+            self._loading = False
 
-        # Сохраняем вопросы и вычисляем max_score
-        self.questions = test_data.get("questions", [])
-        self.max_score = sum(q["weight"] for q in self.questions)
-
-        # 1) Заголовок теста
-        title_lbl = QLabel(f"Тест: {test_data['title']}")
-        title_lbl.setAlignment(Qt.AlignCenter)
-        title_lbl.setStyleSheet(STYLESHEET)
-        self.vbox.addWidget(title_lbl)
-
-        # 2) Вопросы и варианты
-        for idx, q in enumerate(self.questions, start=1):
-            # Создаём QGroupBox для каждого вопроса
-            qbox = QGroupBox(f"{idx}. {q['text']} (вес: {q['weight']})")
-            # Здесь задаём фон и скругление, чтобы совпадало с полями категорий/медиа (#323246)
-            qbox.setStyleSheet(STYLESHEET)
-            q_layout = QVBoxLayout(qbox)
-            q_layout.setContentsMargins(8, 8, 8, 8)
-            q_layout.setSpacing(6)
-
-            # Группа радиокнопок для вариантов
-            button_group = QButtonGroup(qbox)
-            self.option_buttons[q["id"]] = button_group
-
-            for opt in q["options"]:
-                rb = QRadioButton(opt["text"])
-                # Прозрачный фон у радиокнопки, чтобы через неё был виден фон QGroupBox
-                rb.setStyleSheet(STYLESHEET)
-                rb.setProperty("option_id", opt["id"])
-                button_group.addButton(rb, opt["id"])
-                q_layout.addWidget(rb)
-
-            self.vbox.addWidget(qbox)
-
-        # Вставляем «гибкий» отступ, чтобы вопросник занял всё место,
-        # а кнопка осталась прижатой к низу
-        self.vbox.addStretch(1)
+        # Пока наполняем контейнер, отключаем перерисовку: иначе каждый
+        # addWidget вызывает пересчёт layout'а и стилей видимого дерева
+        container = self.vbox.parentWidget()
+        container.setUpdatesEnabled(False)
+        try:
+            # Сохраняем вопросы и вычисляем max_score
+            self.questions = test_data.get("questions", [])
+            self.max_score = sum(q["weight"] for q in self.questions)
+
+            # 1) Заголовок теста
+            title_lbl = QLabel(f"Тест: {test_data['title']}")
+            title_lbl.setAlignment(Qt.AlignCenter)
+            title_lbl.setStyleSheet(STYLESHEET)
+            self.vbox.addWidget(title_lbl)
+
+            # 2) Вопросы и варианты
+            for idx, q in enumerate(self.questions, start=1):
+                # Создаём QGroupBox для каждого вопроса
+                qbox = QGroupBox(f"{idx}. {q['text']} (вес: {q['weight']})")
+                # Здесь задаём фон и скругление, чтобы совпадало с полями категорий/медиа (#323246)
+                qbox.setStyleSheet(STYLESHEET)
+                q_layout = QVBoxLayout(qbox)
+                q_layout.setContentsMargins(8, 8, 8, 8)
+                q_layout.setSpacing(6)
+
+                # Группа радиокнопок для вариантов
+                button_group = QButtonGroup(qbox)
+                self.option_buttons[q["id"]] = button_group
+
+                for opt in q["options"]:
+                    rb = QRadioButton(opt["text"])
+                    # Прозрачный фон у радиокнопки, чтобы через неё был виден фон QGroupBox
+                    rb.setStyleSheet(STYLESHEET)
+                    rb.setProperty("option_id", opt["id"])
+                    button_group.addButton(rb, opt["id"])
+                    q_layout.addWidget(rb)
+
+                self.vbox.addWidget(qbox)
+
+            # Вставляем «гибкий» отступ, чтобы вопросник занял всё место,
+            # а кнопка осталась прижатой к низу
+            self.vbox.addStretch(1)
+        except Exception as e:
+            # недостроенную страницу не оставляем в пуле: load_test для неё больше не вызовется
+            QMessageBox.critical(self, "Ошибка", f"Не удалось отобразить тест: {e}")
+            self.parent_window.stacked.setCurrentIndex(1)
+            self.parent_window.remove_test_page(self)
+            return
+        finally:
+            # Один пересчёт layout'а и одна перерисовка на весь тест
+            container.setUpdatesEnabled(True)
+            container.updateGeometry()
 
+        self._loaded = True
         # Активируем кнопку «Отправить»
         self.submit_btn.setEnabled(True)
 
+    def reset_answers(self):
+        """Снимает выбор со всех радиокнопок, чтобы тест можно было пройти заново."""
+        for group in self.option_buttons.values():
+            # в эксклюзивной группе нельзя снять выбор с отмеченной кнопки
+            group.setExclusive(False)
+            for button in group.buttons():
+                button.setChecked(False)
+            group.setExclusive(True)
+
     @asyncSlot()
     async def on_submit(self):
         """
@@ -201,8 +239,8 @@ class TestWidget(QWidget):
         QMessageBox.information(self, "Готово", "Результаты теста успешно отправлены.")
         # Возвращаемся к главной странице (index = 1 у QStackedLayout)
         self.parent_window.stacked.setCurrentIndex(1)
-        # И удаляем это окно из стека, чтобы при повторном прохождении теста не дублировалось
-        self.parent_window.remove_test_page(self)
+        # Само окно остаётся в стеке: при повторном прохождении теста MainWindow
+        # переиспользует его и только сбрасывает ответы
 
         if body["passed"]:
             try:
@@ -212,12 +250,15 @@ class TestWidget(QWidget):
                 category = await self.client.get_category(category_id)
                 articles = await self.client.list_articles_by_category(category_id)
                 user_id = body["user_id"]
-                for article in articles:
-                    await self.client.update_progress(
+                # Запросы уходят одновременно, клиент склеивает их в один bulk-запрос
+                await asyncio.gather(*(
+                    self.client.update_progress(
                         user_id=user_id,
                         article_id=article["id"],
                         status="done"
                     )
+                    for article in articles
+                ))
             except Exception as e:
                 QMessageBox.critical(self, "Ошибка", f"Не удалось отправить результаты теста: {e}")
                 return
@@ -0,0 +1,70 @@
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+
+class AsyncBatcher:
+    """
+    Coalesces calls made within a short window into a single batched call.
+
+    Every `process(item)` returns a Future. Items are queued until either
+    `max_batch_size` of them are collected or `max_queue_time_ms` passes since
+    the first queued item, after which `process_batch(items)` is called once.
+    `process_batch` must return a list aligned with `items`; an Exception
+    instance in that list is raised to the corresponding caller only.
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_batch_size: int = 32,
+        max_queue_time_ms: int = 10
+    ):
+        self._process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_queue_time = max_queue_time_ms / 1000
+        self._queue: List[Tuple[Any, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def pending(self) -> int:
+        """Number of queued items that have not been sent yet."""
+        return len(self._queue)
+
+    def process(self, item: Any) -> asyncio.Future:
+        """Queue a single item and return a Future with its own result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.append((item, future))
+
+        if len(self._queue) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_queue_time, self._flush)
+        return future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._queue = self._queue, []
+        if batch:
+            asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        items = [item for item, _ in batch]
+        try:
+            results = await self._process_batch(items)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
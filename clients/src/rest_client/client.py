@@ -1,6 +1,37 @@
 ﻿import asyncio
+import logging
+import random
+import socket
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from types import MappingProxyType
 import aiohttp
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
+
+from .batcher import AsyncBatcher
+
+# orjson is optional: it parses and serializes several times faster than the stdlib
+try:
+    import orjson
+
+    json_loads = orjson.loads
+
+    def json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+except ImportError:
+    from json import dumps as json_dumps, loads as json_loads
+
+logger = logging.getLogger(__name__)
+
+# Токен текущего контекста (например, одного запроса в webui). Если задан, он
+# перекрывает self.token только для этого контекста, а не для всего клиента;
+# пустая строка означает запрос без авторизации.
+request_token: ContextVar[Optional[str]] = ContextVar('request_token', default=None)
+
+# GET-запросы, уже отправленные в рамках текущей области (см. request_scope):
+# (path, params) -> Future. None — область не открыта, дедупликации нет.
+_scope_calls: ContextVar[Optional[Dict[Tuple, asyncio.Future]]] = ContextVar('_scope_calls', default=None)
 
 
 class AsyncApiClient:
@@ -8,14 +39,52 @@ class AsyncApiClient:
     Async REST client for interfacing with the REST API using aiohttp.
     """
 
-    def __init__(self, base_url: str, token: Optional[str] = None):
+    # Время жизни закэшированных ответов (секунды) и максимальное число записей
+    CACHE_TTL = 30.0
+    CACHE_MAX_SIZE = 1024
+
+    # Параметры пула соединений: одна сессия и keep-alive на всё время жизни клиента
+    CONNECTION_LIMIT = 100
+    CONNECTION_LIMIT_PER_HOST = 32
+    KEEPALIVE_TIMEOUT = 60
+    DNS_CACHE_TTL = 300
+    # Буферы сокета для пачек POST-запросов (ядро может ограничить их своим максимумом)
+    SOCKET_BUFFER_SIZE = 1 << 20
+    # Зависший сокет не должен навсегда занимать соединение из пула (секунды)
+    REQUEST_TIMEOUT = 30
+    CONNECT_TIMEOUT = 5
+
+    # Повтор GET-запросов при временных сбоях сервера: экспоненциальная
+    # задержка со случайным разбросом, чтобы клиенты не повторяли запросы хором
+    MAX_RETRIES = 3
+    RETRY_BASE_DELAY = 0.1
+    RETRY_MAX_DELAY = 10.0
+    RETRY_STATUSES = frozenset({500, 502, 503, 504})
+
+    def __init__(self, base_url: str, token: Optional[str] = None, unix_socket: Optional[str] = None):
         self.base_url = base_url.rstrip('/')
+        # Путь к Unix-сокету локального сервера; base_url тогда задаёт только Host и пути
+        self.unix_socket = unix_socket
         self.session = None
         self.headers = {'Content-Type': 'application/json'}
         self.token: Optional[str] = None
         if token:
             self.set_token(token)
 
+        # Одинаковые запросы, пришедшие в течение пары миллисекунд,
+        # отправляются на сервер одним bulk/batch-запросом.
+        # Отдельный батчер на каждый токен, чтобы не смешивать запросы разных пользователей.
+        self._batchers: Dict[Tuple[str, Optional[str]], AsyncBatcher] = {}
+
+        # Кэш GET-запросов: (ключ..., токен) -> (момент устаревания, Future с ответом).
+        # Храним Future, чтобы одновременные вызовы ждали один и тот же запрос.
+        # Токен входит в ключ: ответ, полученный одним пользователем, не отдаётся другому.
+        self._cache: Dict[Tuple, Tuple[float, asyncio.Future]] = {}
+        # Последний ответ условных GET-запросов: (path, токен) -> (ETag, данные)
+        self._etag_cache: Dict[Tuple[str, Optional[str]], Tuple[str, Any]] = {}
+        # Готовые заголовки для токенов из request_token: собираются один раз на токен
+        self._token_headers: Dict[str, Mapping[str, str]] = {}
+
     async def __aenter__(self):
         return self
 
@@ -24,62 +93,295 @@ class AsyncApiClient:
 
     async def close(self):
         """Close the underlying HTTP session."""
-        await self.session.close()
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
 
     def set_token(self, token: str):
         """Set the Authorization header for subsequent requests."""
         self.token = token
         self.headers['Authorization'] = f'Bearer {token}'
 
+    def use_token(self, token: Optional[str]) -> None:
+        """
+        Use token only for requests made from the current context (task),
+        leaving the client-wide token untouched. Pass '' for anonymous requests.
+        """
+        request_token.set(token)
+
+    @contextmanager
+    def request_scope(self):
+        """
+        Within this block identical GET requests share one HTTP call, including
+        concurrent ones started with asyncio.gather. Any write clears the scope.
+        Meant to wrap the handling of one incoming request (e.g. in middleware).
+        """
+        reset = _scope_calls.set({})
+        try:
+            yield
+        finally:
+            _scope_calls.reset(reset)
+
+    def _effective_token(self) -> Optional[str]:
+        """Token the current context's requests are sent with ('' or None means anonymous)."""
+        token = request_token.get()
+        return self.token if token is None else token
+
+    def _request_headers(self) -> Mapping[str, str]:
+        token = request_token.get()
+        if token is None:
+            return self.headers
+        headers = self._token_headers.get(token)
+        if headers is None:
+            if len(self._token_headers) >= self.CACHE_MAX_SIZE:
+                self._token_headers.clear()
+            headers = {k: v for k, v in self.headers.items() if k != 'Authorization'}
+            if token:
+                headers['Authorization'] = f'Bearer {token}'
+            # read-only: один и тот же объект отдаётся всем запросам с этим токеном
+            headers = self._token_headers[token] = MappingProxyType(headers)
+        return headers
+
+    def _batcher(self, process_batch: Callable[[List[Any]], Awaitable[List[Any]]]) -> AsyncBatcher:
+        key = (process_batch.__name__, request_token.get())
+        batcher = self._batchers.get(key)
+        if batcher is None:
+            # батчеры давно не встречавшихся токенов без ожидающих запросов не нужны
+            if len(self._batchers) >= self.CACHE_MAX_SIZE:
+                for k in [k for k, b in self._batchers.items() if not b.pending]:
+                    del self._batchers[k]
+            batcher = self._batchers[key] = AsyncBatcher(process_batch)
+        return batcher
+
     async def _request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Any] = None,
+        read_only: bool = False
+    ) -> Any:
+        """
+        read_only marks non-GET requests that change nothing on the server
+        (e.g. POST /articles/batch): they do not clear the request scope.
+        """
+        calls = _scope_calls.get()
+        if calls is None:
+            return await self._send(method, path, params, json)
+        if method != 'GET':
+            if not read_only:
+                calls.clear()
+            return await self._send(method, path, params, json)
+
+        items = params.items() if isinstance(params, dict) else (params or ())
+        key = (path, tuple(items))
+        future = calls.get(key)
+        if future is None:
+            future = calls[key] = asyncio.ensure_future(self._send(method, path, params, json))
+        return await asyncio.shield(future)
+
+    async def _send(
         self,
         method: str,
         path: str,
         params: Optional[Dict[str, Any]] = None,
         json: Optional[Any] = None
     ) -> Any:
-        if self.session is None:
-            self.session = aiohttp.ClientSession()
+        await self.ensure_session()
 
         url = f"{self.base_url}{path}"
+        # метод сессии и заголовки одинаковы для всех попыток — берём их один раз
+        request = self.session.request
+        headers = self._request_headers()
+
+        async def send_once() -> Any:
+            # ошибочный статус (>= 400) сессия сама превращает в ClientResponseError
+            async with request(method, url, headers=headers, params=params, json=json) as resp:
+                if resp.status == 204:
+                    return None
+                return await self._read_json(resp)
 
-        async with self.session.request(
-            method, url, headers=self.headers, params=params, json=json
-        ) as resp:
-            resp.raise_for_status()
-            if resp.status == 204:
-                return None
-            return await resp.json()
+        return await self._with_retries(method, path, send_once)
+
+    async def _with_retries(self, method: str, path: str, send_once: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run send_once(), retrying GETs on 5xx from RETRY_STATUSES, connection
+        errors and timeouts with jittered exponential backoff (see _retry_delay).
+        """
+        # повторять безопасно только идемпотентные запросы
+        retries = self.MAX_RETRIES if method == 'GET' else 0
+
+        for attempt in range(retries + 1):
+            retry_after = None
+            try:
+                return await send_once()
+            except aiohttp.ClientResponseError as e:
+                if e.status not in self.RETRY_STATUSES or attempt == retries:
+                    raise
+                if e.headers is not None:
+                    retry_after = e.headers.get('Retry-After')
+                logger.warning("GET %s returned %s, retrying", path, e.status)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt == retries:
+                    raise
+                logger.warning("GET %s failed (%s), retrying", path, e)
+            await asyncio.sleep(self._retry_delay(attempt, retry_after))
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Delay before retry number attempt + 1; Retry-After (seconds) wins if present."""
+        if retry_after is not None:
+            try:
+                return min(self.RETRY_MAX_DELAY, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
+        delay = min(self.RETRY_MAX_DELAY, self.RETRY_BASE_DELAY * 2 ** attempt)
+        return delay * (0.5 + random.random())
+
+    @staticmethod
+    async def _read_json(resp: aiohttp.ClientResponse) -> Any:
+        # parse the raw bytes directly: no charset detection or str decoding
+        body = await resp.read()
+        return json_loads(body) if body.strip() else None
+
+    async def _conditional_get(self, path: str) -> Any:
+        """
+        GET with If-None-Match: on 304 the previously received body is reused,
+        so an unchanged resource costs one round-trip without a payload.
+        """
+        await self.ensure_session()
+
+        url = f"{self.base_url}{path}"
+        headers = dict(self._request_headers())
+        key = (path, self._effective_token())
+        cached = self._etag_cache.get(key)
+        if cached is not None:
+            headers['If-None-Match'] = cached[0]
+
+        async def send_once() -> Any:
+            async with self.session.get(url, headers=headers) as resp:
+                if resp.status == 304 and cached is not None:
+                    return cached[1]
+                data = await self._read_json(resp)
+                etag = resp.headers.get('ETag')
+                if etag:
+                    if key not in self._etag_cache and len(self._etag_cache) >= self.CACHE_MAX_SIZE:
+                        self._etag_cache.pop(next(iter(self._etag_cache)))
+                    self._etag_cache[key] = (etag, data)
+                else:
+                    self._etag_cache.pop(key, None)
+                return data
+
+        return await self._with_retries('GET', path, send_once)
+
+    async def _cached(self, key: Tuple, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached response for key, or start factory() and cache it.
+        Concurrent callers share one in-flight request; failures are not cached.
+        Entries are kept per token, so users never see each other's responses.
+        """
+        key = (*key, self._effective_token())
+        now = time.monotonic()
+        entry = self._cache.get(key)
+        if entry is None or entry[0] <= now:
+            future = asyncio.ensure_future(factory())
+            self._cache.pop(key, None)
+            self._cache[key] = (now + self.CACHE_TTL, future)
+            future.add_done_callback(lambda f: self._drop_failed(key, f))
+            if len(self._cache) > self.CACHE_MAX_SIZE:
+                # dict хранит порядок вставки — первым удаляем самый старый ключ
+                self._cache.pop(next(iter(self._cache)))
+            entry = self._cache[key]
+        # shield: отмена одного ожидающего не должна отменять общий запрос
+        return await asyncio.shield(entry[1])
+
+    def _drop_failed(self, key: Tuple, future: asyncio.Future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            entry = self._cache.get(key)
+            if entry is not None and entry[1] is future:
+                del self._cache[key]
+
+    def invalidate_cache(self, *kinds: str) -> None:
+        """Drop cached responses of the given kinds, or everything if none given."""
+        if not kinds:
+            self._cache.clear()
+            return
+        for key in [k for k in self._cache if k[0] in kinds]:
+            del self._cache[key]
 
     async def ensure_session(self):
-        if self.session is None:
-            self.session = aiohttp.ClientSession()
+        """
+        Create the shared HTTP session on first use. All requests go through
+        one pooled connector so TCP connections are kept alive and reused.
+        """
+        if self.session is None or self.session.closed:
+            if self.unix_socket:
+                connector = aiohttp.UnixConnector(
+                    path=self.unix_socket,
+                    limit=self.CONNECTION_LIMIT,
+                    limit_per_host=self.CONNECTION_LIMIT_PER_HOST,
+                    keepalive_timeout=self.KEEPALIVE_TIMEOUT,
+                )
+            else:
+                connector = aiohttp.TCPConnector(
+                    limit=self.CONNECTION_LIMIT,
+                    limit_per_host=self.CONNECTION_LIMIT_PER_HOST,
+                    keepalive_timeout=self.KEEPALIVE_TIMEOUT,
+                    ttl_dns_cache=self.DNS_CACHE_TTL,
+                    socket_factory=self._create_socket,
+                )
+            timeout = aiohttp.ClientTimeout(
+                total=self.REQUEST_TIMEOUT,
+                connect=self.CONNECT_TIMEOUT,
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=timeout,
+                json_serialize=json_dumps,
+                raise_for_status=True,
+            )
+
+    @classmethod
+    def _create_socket(cls, addr_info: Tuple) -> socket.socket:
+        """
+        Socket for the TCP connector: Nagle off (aiohttp does it too, but only after
+        connecting) and larger send/receive buffers.
+        """
+        family, type_, proto, _, _ = addr_info
+        sock = socket.socket(family, type_, proto)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, cls.SOCKET_BUFFER_SIZE)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, cls.SOCKET_BUFFER_SIZE)
+        return sock
 
     # Authentication
-    async def register(self, username: str, password: str) -> Dict[str, Any]:
+    async def register(self, username: str, password: str, set_token: bool = True) -> Dict[str, Any]:
         """
         Register a new user and set the received JWT for future requests.
+        With set_token=False the client-wide token is left untouched (a client
+        shared by many users keeps each token itself, see use_token).
         """
         await self.ensure_session()
         payload = {'username': username, 'password': password}
         token_data = await self._request('POST', '/auth/register', json=payload)
-        self.set_token(token_data['access_token'])
+        if set_token:
+            self.set_token(token_data['access_token'])
         return token_data
 
-    async def login(self, username: str, password: str) -> Dict[str, Any]:
+    async def login(self, username: str, password: str, set_token: bool = True) -> Dict[str, Any]:
         """
         Log in with username/password, receive and set JWT for future requests.
+        With set_token=False only the token data is returned, as in register().
         """
         await self.ensure_session()
         url = f"{self.base_url}/auth/login"
         form = {'username': username, 'password': password}
         # OAuth2 form requires x-www-form-urlencoded
-        headers = {k: v for k, v in self.headers.items() if k != 'Content-Type'}
+        headers = {k: v for k, v in self._request_headers().items() if k != 'Content-Type'}
         headers['Content-Type'] = 'application/x-www-form-urlencoded'
         async with self.session.post(url, headers=headers, data=form) as resp:
-            resp.raise_for_status()
-            token_data = await resp.json()
-        self.set_token(token_data['access_token'])
+            token_data = await self._read_json(resp)
+        if set_token:
+            self.set_token(token_data['access_token'])
         return token_data
 
     async def me(self) -> Dict[str, Any]:
@@ -90,17 +392,35 @@ class AsyncApiClient:
 
     # Articles
     async def list_articles(self) -> List[Dict[str, Any]]:
-        return await self._request('GET', '/articles')
-
-    # Articles
-    async def list_articles(self) -> List[Dict[str, Any]]:
-        return await self._request('GET', '/articles')
+        """All articles; an unchanged list is revalidated with If-None-Match (304)."""
+        return await self._conditional_get('/articles')
 
     async def get_article(self, article_id: int) -> Dict[str, Any]:
-        return await self._request('GET', f'/articles/{article_id}')
+        return await self._cached(
+            ('article', article_id),
+            lambda: self._batcher(self._get_articles_batch).process(article_id)
+        )
+
+    async def get_articles(self, article_ids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Fetch several articles in one request (POST /articles/batch).
+        Unknown ids are skipped, so the result may be shorter than article_ids.
+        """
+        return await self._request('POST', '/articles/batch', json={'ids': article_ids}, read_only=True)
+
+    async def _get_articles_batch(self, article_ids: List[int]) -> List[Any]:
+        articles = await self.get_articles(list(dict.fromkeys(article_ids)))
+        by_id = {a['id']: a for a in articles}
+        return [
+            by_id.get(article_id) or KeyError(f"Article {article_id} not found")
+            for article_id in article_ids
+        ]
 
     async def list_articles_by_category(self, category_id: int) -> List[Dict[str, Any]]:
-        return await self._request('GET', f'/articles/category/{category_id}')
+        return await self._cached(
+            ('articles_by_category', category_id),
+            lambda: self._request('GET', f'/articles/category/{category_id}')
+        )
 
     async def create_article(
         self, category_id: int, title: str, content: str, content_type: str
@@ -111,7 +431,9 @@ class AsyncApiClient:
             'content': content,
             'content_type': content_type
         }
-        return await self._request('POST', '/articles', json=payload)
+        result = await self._request('POST', '/articles', json=payload)
+        self.invalidate_cache('articles_by_category')
+        return result
 
     async def update_article(
         self,
@@ -127,10 +449,14 @@ class AsyncApiClient:
             payload['content'] = content
         if content_type is not None:
             payload['content_type'] = content_type
-        return await self._request('PUT', f'/articles/{article_id}', json=payload)
+        result = await self._request('PUT', f'/articles/{article_id}', json=payload)
+        self.invalidate_cache('article', 'articles_by_category')
+        return result
 
     async def delete_article(self, article_id: int) -> None:
-        return await self._request('DELETE', f'/articles/{article_id}')
+        result = await self._request('DELETE', f'/articles/{article_id}')
+        self.invalidate_cache('article', 'articles_by_category')
+        return result
 
     # Assignments
     async def list_assignments(
@@ -204,7 +530,10 @@ class AsyncApiClient:
         return await self._request('GET', '/categories')
 
     async def get_category_tree(self) -> List[Dict[str, Any]]:
-        return await self._request('GET', '/categories/tree')
+        return await self._cached(
+            ('category_tree',),
+            lambda: self._conditional_get('/categories/tree')
+        )
 
     async def get_category(self, category_id: int) -> Dict[str, Any]:
         return await self._request('GET', f'/categories/{category_id}')
@@ -217,7 +546,9 @@ class AsyncApiClient:
         payload = {'title': title}
         if parent_id is not None:
             payload['parent_id'] = parent_id
-        return await self._request('POST', '/categories', json=payload)
+        result = await self._request('POST', '/categories', json=payload)
+        self.invalidate_cache('category_tree')
+        return result
 
     async def update_category(
         self,
@@ -230,10 +561,15 @@ class AsyncApiClient:
             payload['title'] = title
         if parent_id is not None:
             payload['parent_id'] = parent_id
-        return await self._request('PUT', f'/categories/{category_id}', json=payload)
+        result = await self._request('PUT', f'/categories/{category_id}', json=payload)
+        self.invalidate_cache('category_tree')
+        return result
 
     async def delete_category(self, category_id: int) -> None:
-        return await self._request('DELETE', f'/categories/{category_id}')
+        # вместе с категорией каскадно удаляются её статьи и тесты
+        result = await self._request('DELETE', f'/categories/{category_id}')
+        self.invalidate_cache()
+        return result
 
     # Media
     async def list_media(self, article_id: Optional[int] = None) -> List[Dict[str, Any]]:
@@ -263,6 +599,43 @@ class AsyncApiClient:
         }
         return await self._request('POST', '/media', json=payload)
 
+    async def create_media_bulk(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Create several media items in one request (POST /media/bulk).
+        Each item has article_id, media_type, url and optionally sort_order.
+        """
+        try:
+            return await self._request('POST', '/media/bulk', json={'items': items})
+        except aiohttp.ClientResponseError as e:
+            if e.status not in (404, 405):
+                raise
+
+        # Сервер без /media/bulk: отправляем POST /media по одному. Фиксированный пул
+        # обработчиков разбирает общую очередь — одновременно идёт не больше запросов,
+        # чем разрешено соединений на один хост, и не создаётся задача на каждый элемент
+        queue: asyncio.Queue = asyncio.Queue()
+        for index, item in enumerate(items):
+            queue.put_nowait((index, item))
+        results: List[Any] = [None] * len(items)
+
+        async def worker() -> None:
+            while not queue.empty():
+                index, item = queue.get_nowait()
+                results[index] = await self.create_media(**item)
+
+        workers = [
+            asyncio.ensure_future(worker())
+            for _ in range(min(self.CONNECTION_LIMIT_PER_HOST, len(items)))
+        ]
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            # первая ошибка прерывает загрузку: остальные обработчики не берут новые элементы
+            for w in workers:
+                w.cancel()
+            raise
+        return results
+
     async def update_media(
         self,
         media_id: int,
@@ -295,6 +668,13 @@ class AsyncApiClient:
     async def list_options_by_question(self, question_id: int) -> List[Dict[str, Any]]:
         return await self._request('GET', f'/options/question/{question_id}')
 
+    async def list_options_by_test(self, test_id: int) -> List[Dict[str, Any]]:
+        """
+        Все варианты ответов для всех вопросов теста одним запросом.
+        Делает GET /tests/{test_id}/options-flat; у каждого варианта есть question_id.
+        """
+        return await self._request('GET', f'/tests/{test_id}/options-flat')
+
     async def create_option(
         self,
         question_id: int,
@@ -356,7 +736,16 @@ class AsyncApiClient:
         status: str
     ) -> Dict[str, Any]:
         payload = {'user_id': user_id, 'article_id': article_id, 'status': status}
-        return await self._request('PUT', '/progress', json=payload)
+        return await self._batcher(self._update_progress_batch).process(payload)
+
+    async def _update_progress_batch(self, payloads: List[Dict[str, Any]]) -> List[Any]:
+        updated = await self._request('PUT', '/progress/bulk', json=payloads)
+        by_key = {(p['user_id'], p['article_id']): p for p in updated}
+        return [
+            by_key.get((p['user_id'], p['article_id']))
+            or KeyError(f"Progress not found for user {p['user_id']}, article {p['article_id']}")
+            for p in payloads
+        ]
 
     async def delete_progress(self, progress_id: int) -> None:
         return await self._request('DELETE', f'/progress/{progress_id}')
@@ -449,10 +838,52 @@ class AsyncApiClient:
         return await self._request('GET', '/tests')
 
     async def get_test(self, test_id: int) -> Dict[str, Any]:
-        return await self._request('GET', f'/tests/{test_id}')
+        return await self._cached(
+            ('test', test_id),
+            lambda: self._batcher(self._get_tests_batch).process(test_id)
+        )
+
+    async def get_tests(self, test_ids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Fetch several tests in one request (POST /tests/batch).
+        Unknown ids are skipped, so the result may be shorter than test_ids.
+        """
+        return await self._request('POST', '/tests/batch', json={'ids': test_ids}, read_only=True)
+
+    async def _get_tests_batch(self, test_ids: List[int]) -> List[Any]:
+        tests = await self.get_tests(list(dict.fromkeys(test_ids)))
+        by_id = {t['id']: t for t in tests}
+        return [
+            by_id.get(test_id) or KeyError(f"Test {test_id} not found")
+            for test_id in test_ids
+        ]
 
     async def list_tests_by_category(self, category_id: int) -> List[Dict[str, Any]]:
-        return await self._request('GET', f'/tests/category/{category_id}')
+        return await self._cached(
+            ('tests_by_category', category_id),
+            lambda: self._request('GET', f'/tests/category/{category_id}')
+        )
+
+    async def list_tests_by_categories(
+        self,
+        category_ids: List[int]
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Tests of several categories in one request, grouped by category id.
+        Делает GET /tests/by-categories?category_id=...&category_id=...
+        """
+        if not category_ids:
+            return {}
+        ids = sorted(set(category_ids))
+        grouped = await self._cached(
+            ('tests_by_category', tuple(ids)),
+            lambda: self._request(
+                'GET', '/tests/by-categories',
+                params=[('category_id', cid) for cid in ids]
+            )
+        )
+        # JSON object keys arrive as strings
+        return {int(cid): tests for cid, tests in grouped.items()}
 
     async def create_test(
         self,
@@ -461,7 +892,9 @@ class AsyncApiClient:
         max_attempts: int = 3
     ) -> Dict[str, Any]:
         payload = {'category_id': category_id, 'title': title, 'max_attempts': max_attempts}
-        return await self._request('POST', '/tests', json=payload)
+        result = await self._request('POST', '/tests', json=payload)
+        self.invalidate_cache('tests_by_category')
+        return result
 
     async def update_test(
         self,
@@ -474,13 +907,19 @@ class AsyncApiClient:
             payload['title'] = title
         if max_attempts is not None:
             payload['max_attempts'] = max_attempts
-        return await self._request('PUT', f'/tests/{test_id}', json=payload)
+        result = await self._request('PUT', f'/tests/{test_id}', json=payload)
+        self.invalidate_cache('test', 'tests_by_category')
+        return result
 
     async def delete_test(self, test_id: int) -> None:
-        return await self._request('DELETE', f'/tests/{test_id}')
+        result = await self._request('DELETE', f'/tests/{test_id}')
+        self.invalidate_cache('test', 'tests_by_category')
+        return result
 
     async def import_tests(self, tests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        return await self._request('POST', '/tests/import', json=tests)
+        result = await self._request('POST', '/tests/import', json=tests)
+        self.invalidate_cache('tests_by_category')
+        return result
 
     async def export_tests(self) -> List[Dict[str, Any]]:
         return await self._request('GET', '/tests/export')
@@ -513,7 +952,7 @@ class AsyncApiClient:
         return await self._request('DELETE', f'/users/{user_id}')
 
     async def export_users(self) -> List[Dict[str, Any]]:
-        return await self._request('POST', '/users/export')
+        return await self._request('POST', '/users/export', read_only=True)
 
     async def import_users(self, users: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         return await self._request('POST', '/users/import', json=users)
@@ -523,10 +962,4 @@ class AsyncApiClient:
         Получить список всех ролей.
         Делает GET /roles и возвращает список словарей с данными ролей.
         """
-        return await self._request('GET', '/roles')
-
-    async def close(self):
-        try:
-            await self.session.close()
-        except:
-            pass
\ No newline at end of file
+        return await self._request('GET', '/roles')
\ No newline at end of file
@@ -1,5 +1,5 @@
 ﻿from abc import ABC
-from typing import List, Dict, Any, Iterator
+from typing import List, Dict, Any, Iterator, Optional
 
 from .abc_tester import (
     BaseTester
@@ -29,6 +29,14 @@ class WebTester(BaseTester, ABC):
 
         # internal storage of question dicts
         self._questions: List[Dict[str, Any]] = []
+        # str(question_id) -> question dict, for O(1) lookups
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        # str(question_id) -> {str(option_id): option} and {option_text: option};
+        # kept outside the question dicts so they don't end up in serialized state
+        self._options_by_id: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._options_by_text: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # str(question_id) -> answer, updated by answer()
+        self._answers: Dict[str, Any] = {}
         for item in (questions or []):
             try:
                 q = item['question']
@@ -43,6 +51,13 @@ class WebTester(BaseTester, ABC):
                 'options':        opts,
                 # 'answer' will be added once user answers
             })
+            self._by_id[str(q['id'])] = self._questions[-1]
+            self._options_by_id[str(q['id'])] = {str(o['id']): o for o in opts}
+            self._options_by_text[str(q['id'])] = {
+                o['text']: o for o in opts if o.get('text') is not None
+            }
+
+        self._max_score = sum(q['weight'] or 0 for q in self._questions)
 
         # iterator cursor
         self._idx = 0
@@ -52,17 +67,18 @@ class WebTester(BaseTester, ABC):
         """List of question dictionaries (with possible 'answer' keys)."""
         return self._questions
 
+    @property
+    def max_score(self) -> int:
+        """Sum of all question weights."""
+        return self._max_score
+
     @property
     def answers(self) -> Dict[str, Any]:
         """
         Returns a mapping of question_id -> answer (whatever was saved),
         only including questions that have been answered.
         """
-        return {
-            str(q['id']): q['answer']
-            for q in self._questions
-            if 'answer' in q
-        }
+        return self._answers
 
     def _reset_iterator(self) -> None:
         """(Re)start iteration from the first question."""
@@ -82,10 +98,23 @@ class WebTester(BaseTester, ABC):
 
     def get_question(self, question_id: str) -> Dict[str, Any]:
         """Lookup a question by its id."""
-        for q in self._questions:
-            if str(q['id']) == str(question_id):
-                return q
-        raise KeyError(f"No question found with id {question_id!r}")
+        try:
+            return self._by_id[str(question_id)]
+        except KeyError:
+            raise KeyError(f"No question found with id {question_id!r}") from None
+
+    def get_option(self, question_id: str, answer: Any) -> Optional[Dict[str, Any]]:
+        """
+        Return the option matching answer (option id or text) for the
+        question, or None if there is no such option.
+        """
+        key = str(question_id)
+        if key not in self._by_id:
+            raise KeyError(f"No question found with id {question_id!r}")
+        opt = self._options_by_id[key].get(str(answer))
+        if opt is None and isinstance(answer, str):
+            opt = self._options_by_text[key].get(answer)
+        return opt
 
     def get_answer_text(self, question_id: str, answer: Any) -> List[str]:
         """
@@ -93,11 +122,9 @@ class WebTester(BaseTester, ABC):
         return [question_text, user_answer_text].
         """
         q = self.get_question(question_id)
-        question_text = q['text']
-        # find the matching option
-        for opt in q['options']:
-            if str(opt['id']) == str(answer) or opt['text'] == answer:
-                return [question_text, opt['text']]
+        opt = self.get_option(question_id, answer)
+        if opt is not None:
+            return [q['text'], opt['text']]
         raise ValueError(f"Answer {answer!r} not found among options for question {question_id}")
 
     def answer(self, question_id: str, answer: Any) -> None:
@@ -107,8 +134,9 @@ class WebTester(BaseTester, ABC):
         """
         q = self.get_question(question_id)
         q['answer'] = answer
+        self._answers[str(q['id'])] = answer
 
     def results(self) -> Dict[str, Any]:
-        """Return the same mapping as .answers."""
-        return self.answers
+        """Return a copy of the .answers mapping."""
+        return dict(self._answers)
 
@@ -1,8 +1,15 @@
-﻿import json
+﻿import asyncio
+import hashlib
+import json
 import os
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
+import jinja2
 import markdown
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request, Form, Depends
@@ -14,26 +21,71 @@ from starlette.middleware.sessions import SessionMiddleware
 from src.rest_client import AsyncApiClient
 from src.tester import WebTester
 
+# orjson is optional; without it the stdlib json module is used
+try:
+    import orjson
+
+    def json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+    json_loads = orjson.loads
+except ImportError:
+    json_dumps, json_loads = json.dumps, json.loads
+
 load_dotenv()
 
 SERVER_PORT = os.environ.get("SERVER_PORT")
 
 API_BASE = f"http://127.0.0.1:{SERVER_PORT}/api"
+# Если сервер слушает Unix-сокет (uvicorn --uds), ходим к нему напрямую, минуя TCP
+API_UNIX_SOCKET = os.environ.get("API_UNIX_SOCKET")
+# Ключ подписи cookie сессии (в ней лежит JWT пользователя) — задаётся в .env
+SESSION_SECRET = os.environ.get("SESSION_SECRET", "CHANGE_THIS_TO_SECRET")
 
 app = FastAPI()
-app.add_middleware(SessionMiddleware, secret_key="CHANGE_THIS_TO_SECRET")
+app.add_middleware(SessionMiddleware, secret_key=SESSION_SECRET)
 
 app.mount("/static", StaticFiles(directory="./src/webui/static"), name="static")
 
 media_dir = Path(__file__).parent / "media"
 app.mount("/media", StaticFiles(directory=str(media_dir)), name="media")
-templates = Jinja2Templates(directory="./src/webui/templates")
-
-client = AsyncApiClient(API_BASE)
-def get_client(request: Request) -> AsyncApiClient:
-    token = request.session.get("token")
-    if token:
-        client.set_token(token)
+# Templates are compiled once: bytecode is cached on disk between restarts and
+# auto_reload is off, so renders don't stat the template files
+templates_env = jinja2.Environment(
+    loader=jinja2.FileSystemLoader("./src/webui/templates"),
+    autoescape=True,
+    bytecode_cache=jinja2.FileSystemBytecodeCache(),
+    auto_reload=False,
+)
+templates = Jinja2Templates(env=templates_env)
+
+client = AsyncApiClient(API_BASE, unix_socket=API_UNIX_SOCKET)
+
+@app.middleware("http")
+async def dedupe_api_calls(request: Request, call_next):
+    # identical API GETs made while handling one request go out only once
+    with client.request_scope():
+        return await call_next(request)
+
+@app.on_event("startup")
+async def open_client_session():
+    await client.ensure_session()
+
+@app.on_event("startup")
+def warm_templates():
+    for name in templates_env.list_templates(extensions=["html"]):
+        templates_env.get_template(name)
+
+@app.on_event("shutdown")
+async def close_client_session():
+    await client.close()
+    _md_executor.shutdown(wait=False)
+
+async def get_client(request: Request) -> AsyncApiClient:
+    # The token is bound to this request's context only, so concurrent requests
+    # of different users share the client (and its connection pool) safely.
+    # Async so it runs in the request's task and the context reaches the handler.
+    client.use_token(request.session.get("token") or "")
     return client
 
 @app.get("/", response_class=HTMLResponse)
@@ -55,8 +107,9 @@ async def login_post(
     cli: AsyncApiClient = Depends(get_client)
 ):
     try:
-        await cli.login(username, password)
-        request.session["token"] = cli.token
+        # токен хранится в сессии пользователя, а не в общем для всех клиенте
+        token_data = await cli.login(username, password, set_token=False)
+        request.session["token"] = token_data["access_token"]
         return RedirectResponse("/categories", status_code=303)
     except Exception:
         return templates.TemplateResponse("login.html", {"request": request, "error": "Login failed"})
@@ -69,13 +122,29 @@ async def register_post(
     cli: AsyncApiClient = Depends(get_client)
 ):
     try:
-        await cli.register(username, password)
+        await cli.register(username, password, set_token=False)
         msg = "Registered successfully. Please login."
     except Exception:
         msg = "Registration failed."
     return templates.TemplateResponse("login.html", {"request": request, "error": msg})
 
 # --- Categories / Articles listing ---
+# (tree, {id: node}) for the last category tree seen; the client returns the
+# same tree object while it is cached or not modified, so the index is reused
+_category_index: tuple[list, dict] = ([], {})
+
+def get_category_index(tree: list[dict]) -> dict[int, dict]:
+    global _category_index
+    if _category_index[0] is not tree:
+        index = {}
+        stack = list(tree)
+        while stack:
+            n = stack.pop()
+            index[n["id"]] = n
+            stack.extend(n.get("children", ()))
+        _category_index = (tree, index)
+    return _category_index[1]
+
 @app.get("/categories", response_class=HTMLResponse)
 @app.get("/categories/{parent_id}", response_class=HTMLResponse)
 async def view_categories(
@@ -85,16 +154,6 @@ async def view_categories(
 ):
     tree = await cli.get_category_tree()
 
-    # find node in tree
-    def find_node(nodes: list[dict], target: int) -> dict|None:
-        for n in nodes:
-            if n["id"] == target:
-                return n
-            found = find_node(n.get("children", []), target)
-            if found:
-                return found
-        return None
-
     if parent_id is None:
         # top-level categories
         sidebar_items = [
@@ -103,7 +162,7 @@ async def view_categories(
         ]
         heading = "Выберите категорию"
     else:
-        node = find_node(tree, parent_id)
+        node = get_category_index(tree).get(parent_id)
         children = node.get("children", []) if node else []
         if children:
             # show subcategories
@@ -114,8 +173,10 @@ async def view_categories(
             heading = "Подкатегории"
         else:
             # no subcategories: list articles and tests
-            articles = await cli.list_articles_by_category(parent_id)
-            tests    = await cli.list_tests_by_category(parent_id)
+            articles, tests = await asyncio.gather(
+                cli.list_articles_by_category(parent_id),
+                cli.list_tests_by_category(parent_id),
+            )
             sidebar_items = (
                 [{"id": a["id"], "title": a["title"], "type": "article"} for a in articles]
                 + [{"id": t["id"], "title": t["title"], "type": "test"} for t in tests]
@@ -132,6 +193,25 @@ async def view_categories(
     })
 
 # --- Просмотр статьи ---
+# Rendered markdown keyed by (article id, content hash), least recently used evicted first
+MD_CACHE_SIZE = 512
+_md_cache: OrderedDict[tuple[int, str], str] = OrderedDict()
+# cache misses are rendered on one dedicated worker so a long article
+# doesn't stall the event loop for other requests
+_md_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="markdown")
+
+async def render_markdown(article_id: int, text: str) -> str:
+    key = (article_id, hashlib.blake2b(text.encode(), digest_size=8).hexdigest())
+    html = _md_cache.get(key)
+    if html is not None:
+        _md_cache.move_to_end(key)
+        return html
+    html = await asyncio.get_running_loop().run_in_executor(_md_executor, markdown.markdown, text)
+    _md_cache[key] = html
+    if len(_md_cache) > MD_CACHE_SIZE:
+        _md_cache.popitem(last=False)
+    return html
+
 @app.get("/article/{article_id}", response_class=HTMLResponse)
 async def view_article(
     request: Request,
@@ -139,17 +219,20 @@ async def view_article(
     cli: AsyncApiClient = Depends(get_client),
 ):
     art = await cli.get_article(article_id)
+    # media and the sidebar (articles of the same category) are independent
+    cat_id = art.get("category_id")
+    media, articles = await asyncio.gather(
+        cli.list_media(article_id),
+        cli.list_articles_by_category(cat_id),
+    )
     if art["content_type"] == "markdown":
-        content = markdown.markdown(art["content"])
+        content = await render_markdown(art["id"], art["content"])
     else:
         content = art["content"]
-    media = await cli.list_media(article_id)
     for m in media:
         m["url"] = f"/media/{m['url']}"
 
     # в левой панели показываем статьи той же категории
-    cat_id = art.get("category_id")
-    articles = await cli.list_articles_by_category(cat_id)
     sidebar_items = [
         {"id": a["id"], "title": a["title"], "type": "article"}
         for a in articles
@@ -165,6 +248,27 @@ async def view_article(
         "media": media,
     })
 
+# --- Прохождение теста ---
+# Running testers live in-process, keyed by a random token echoed in the form,
+# so a POST only carries {token, current_index, score} instead of all questions
+TEST_SESSION_TTL = 60 * 60
+_test_sessions: dict[str, tuple[float, WebTester]] = {}
+
+def store_tester(tester: WebTester) -> str:
+    now = time.monotonic()
+    for token in [t for t, (expires, _) in _test_sessions.items() if expires <= now]:
+        del _test_sessions[token]
+    token = uuid.uuid4().hex
+    _test_sessions[token] = (now + TEST_SESSION_TTL, tester)
+    return token
+
+def load_tester(token: str) -> WebTester | None:
+    entry = _test_sessions.get(token)
+    if entry is None or entry[0] <= time.monotonic():
+        _test_sessions.pop(token, None)
+        return None
+    return entry[1]
+
 @app.get("/test/{test_id}", response_class=HTMLResponse)
 async def view_test(
     request: Request,
@@ -172,15 +276,18 @@ async def view_test(
     cli: AsyncApiClient = Depends(get_client),
 ):
 
-    # fetch test info
-    test = await cli.get_test(test_id)
-
-    # fetch questions and options
-    questions = await cli.list_questions_by_test(test_id)
-    q_with_opts = []
-    for q in questions:
-        opts = await cli.list_options_by_question(q["id"])
-        q_with_opts.append({"question": q, "options": opts})
+    # fetch test info, questions and all their options concurrently
+    test, questions, options = await asyncio.gather(
+        cli.get_test(test_id),
+        cli.list_questions_by_test(test_id),
+        cli.list_options_by_test(test_id),
+    )
+    opts_by_question = {q["id"]: [] for q in questions}
+    for opt in options:
+        opts_by_question.setdefault(opt["question_id"], []).append(opt)
+    q_with_opts = [
+        {"question": q, "options": opts_by_question[q["id"]]} for q in questions
+    ]
 
     tester = WebTester(
         test_id=test["id"],
@@ -192,19 +299,17 @@ async def view_test(
 
     # sidebar: show same list as for article for that category
     cat_id = test.get("category_id")
-    articles = await cli.list_articles_by_category(cat_id)
-    tests    = await cli.list_tests_by_category(cat_id)
+    articles, tests = await asyncio.gather(
+        cli.list_articles_by_category(cat_id),
+        cli.list_tests_by_category(cat_id),
+    )
     sidebar_items = (
         [{"id": a["id"], "title": a["title"], "type": "article"} for a in articles]
         + [{"id": t["id"], "title": t["title"], "type": "test"} for t in tests]
     )
 
     state = {
-        "test_id":      tester.test_id,
-        "category_id":  tester.category_id,
-        "title":        tester.title,
-        "max_attempts": tester.max_attempts,
-        "questions":    tester.questions,
+        "token":         store_tester(tester),
         "current_index": 0,
         "score":         0,
     }
@@ -217,7 +322,7 @@ async def view_test(
         "active_id": test_id,
         "heading": "Материалы и тесты",
         "tester": tester,
-        "tester_state": json.dumps(state),
+        "tester_state": json_dumps(state),
         "questions": first_q,
     })
 
@@ -227,15 +332,11 @@ async def submit_test(request: Request,
                       tester_json: str = Form(...),
                       answer: int       = Form(...),
 ):
-    # 1. reconstruct
-    state = json.loads(tester_json)
-    tester = WebTester(
-        test_id=state["test_id"],
-        category_id=state["category_id"],
-        title=state["title"],
-        max_attempts=state["max_attempts"],
-        questions=state["questions"],
-    )
+    # 1. look up the running tester; start over if it has expired
+    state = json_loads(tester_json)
+    tester = load_tester(state.get("token", ""))
+    if tester is None or tester.test_id != test_id:
+        return RedirectResponse(f"/test/{test_id}", status_code=303)
     # restore pointer & score into the *private* attrs the class really uses
     idx = state.get("current_index", 0)
     tester._idx = idx
@@ -247,10 +348,9 @@ async def submit_test(request: Request,
     tester.answer(qid, answer)
 
     # 3. grade
-    for opt in current["options"]:
-        if opt["id"] == answer and opt.get("is_correct"):
-            tester.score += current["weight"]
-            break
+    opt = tester.get_option(qid, answer)
+    if opt and opt.get("is_correct"):
+        tester.score += current["weight"]
 
     # 4. advance the iterator
     tester._idx += 1
@@ -260,28 +360,24 @@ async def submit_test(request: Request,
     if next_idx < len(tester.questions):
         next_q = tester.questions[next_idx]
         new_state = {
-            "test_id":       tester.test_id,
-            "category_id":   tester.category_id,
-            "title":         tester.title,
-            "max_attempts":  tester.max_attempts,
-            "questions":     tester.questions,
+            "token":         state["token"],
             "current_index": next_idx,
             "score":         tester.score,
         }
         return templates.TemplateResponse("test.html", {
             "request":      request,
             "tester": tester,
-            "tester_state": json.dumps(new_state),
+            "tester_state": json_dumps(new_state),
             "questions":    next_q,
         })
 
     # 6. …or render results
     else:
-        max_score = sum(q["weight"] for q in tester.questions)
+        _test_sessions.pop(state["token"], None)
         return templates.TemplateResponse("test_result.html", {
             "request":   request,
             "score":     tester.score,
-            "max_score": max_score,
+            "max_score": tester.max_score,
             "tester": tester,
         })
 
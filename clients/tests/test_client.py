@@ -1,6 +1,9 @@
-﻿import pytest
-from aioresponses import aioresponses
+﻿import asyncio
+
+import pytest
+from aioresponses import CallbackResult, aioresponses
 import aiohttp
+from yarl import URL
 
 from src import AsyncApiClient
 
@@ -10,6 +13,7 @@ async def client(event_loop):
     client = AsyncApiClient(base_url)
     yield client
     # cleanup
+    client.use_token(None)
     if client.session and not client.session.closed:
         await client.close()
 
@@ -44,10 +48,92 @@ async def test_get_article(client):
     article_id = 42
     expected = {"id": article_id, "title": "Article 42", "content": "Content", "content_type": "html"}
     with aioresponses() as m:
-        m.get(f"{client.base_url}/articles/{article_id}", payload=expected)
+        m.post(f"{client.base_url}/articles/batch", payload=[expected])
         result = await client.get_article(article_id)
         assert result == expected
 
+@pytest.mark.asyncio
+async def test_get_article_batches_concurrent_calls(client):
+    expected = [{"id": i, "title": f"Article {i}"} for i in (1, 2, 3)]
+    with aioresponses() as m:
+        m.post(f"{client.base_url}/articles/batch", payload=expected)
+        result = await asyncio.gather(*(client.get_article(i) for i in (3, 1, 2)))
+        assert result == [expected[2], expected[0], expected[1]]
+        # все три вызова ушли одним POST-запросом
+        assert sum(len(calls) for calls in m.requests.values()) == 1
+
+@pytest.mark.asyncio
+async def test_get_article_batch_missing_id(client):
+    with aioresponses() as m:
+        m.post(f"{client.base_url}/articles/batch", payload=[])
+        with pytest.raises(KeyError):
+            await client.get_article(404)
+
+@pytest.mark.asyncio
+async def test_get_article_is_cached(client):
+    expected = {"id": 5, "title": "Article 5"}
+    with aioresponses() as m:
+        m.post(f"{client.base_url}/articles/batch", payload=[expected])
+        first = await client.get_article(5)
+        second = await client.get_article(5)
+        assert first == second == expected
+        assert sum(len(calls) for calls in m.requests.values()) == 1
+
+@pytest.mark.asyncio
+async def test_update_article_invalidates_cache(client):
+    with aioresponses() as m:
+        m.post(f"{client.base_url}/articles/batch", payload=[{"id": 5, "title": "Old"}])
+        m.put(f"{client.base_url}/articles/5", payload={"id": 5, "title": "New"})
+        m.post(f"{client.base_url}/articles/batch", payload=[{"id": 5, "title": "New"}])
+        assert (await client.get_article(5))["title"] == "Old"
+        await client.update_article(5, title="New")
+        assert (await client.get_article(5))["title"] == "New"
+
+@pytest.mark.asyncio
+async def test_cache_is_not_shared_between_tokens(client):
+    tree = [{"id": 1, "title": "Root", "children": []}]
+    with aioresponses() as m:
+        m.post(f"{client.base_url}/articles/batch", payload=[{"id": 1, "title": "Secret"}])
+        m.get(f"{client.base_url}/categories/tree", payload=tree, headers={"ETag": '"v1"'})
+        m.post(f"{client.base_url}/articles/batch", status=401)
+        m.get(f"{client.base_url}/categories/tree", status=401)
+
+        client.use_token("user-a")
+        assert (await client.get_article(1))["title"] == "Secret"
+        assert await client.get_category_tree() == tree
+
+        # анонимный запрос после авторизованного идёт на сервер, а не в кэш
+        client.use_token("")
+        with pytest.raises(aiohttp.ClientResponseError):
+            await client.get_article(1)
+        with pytest.raises(aiohttp.ClientResponseError):
+            await client.get_category_tree()
+        tree_requests = m.requests[("GET", URL(f"{client.base_url}/categories/tree"))]
+        assert "If-None-Match" not in tree_requests[1].kwargs["headers"]
+        assert "Authorization" not in tree_requests[1].kwargs["headers"]
+
+@pytest.mark.asyncio
+async def test_get_articles(client):
+    expected = [{"id": 1, "title": "A"}, {"id": 2, "title": "B"}]
+    with aioresponses() as m:
+        m.post(f"{client.base_url}/articles/batch", payload=expected)
+        result = await client.get_articles([1, 2])
+        assert result == expected
+
+@pytest.mark.asyncio
+async def test_update_progress_bulk(client):
+    updated = [
+        {"id": 1, "user_id": 1, "article_id": 10, "status": "done"},
+        {"id": 2, "user_id": 1, "article_id": 11, "status": "done"},
+    ]
+    with aioresponses() as m:
+        m.put(f"{client.base_url}/progress/bulk", payload=updated)
+        result = await asyncio.gather(
+            client.update_progress(user_id=1, article_id=10, status="done"),
+            client.update_progress(user_id=1, article_id=11, status="done"),
+        )
+        assert result == updated
+
 @pytest.mark.asyncio
 async def test_create_article(client):
     payload = {
@@ -96,6 +182,16 @@ async def test_login_and_me(client):
         user_info = await client.me()
         assert user_info == me_data
 
+@pytest.mark.asyncio
+async def test_login_without_setting_client_token(client):
+    with aioresponses() as m:
+        m.post(f"{client.base_url}/auth/login", payload={"access_token": "abc123"})
+        m.post(f"{client.base_url}/auth/register", payload={"access_token": "def456"})
+        assert (await client.login("user1", "pass1", set_token=False))["access_token"] == "abc123"
+        assert (await client.register("user2", "pass2", set_token=False))["access_token"] == "def456"
+    assert client.token is None
+    assert "Authorization" not in client.headers
+
 @pytest.mark.asyncio
 async def test_list_assignments_with_filters(client):
     expected = [{"id": 1, "user_id": 2, "group_id": None, "category_id": 3}]
@@ -103,3 +199,155 @@ async def test_list_assignments_with_filters(client):
         m.get(f"{client.base_url}/assignments?user_id=2&category_id=3", payload=expected)
         result = await client.list_assignments(user_id=2, category_id=3)
         assert result == expected
+
+@pytest.mark.asyncio
+async def test_get_category_tree_reuses_body_on_304(client):
+    tree = [{"id": 1, "title": "Root", "children": []}]
+    with aioresponses() as m:
+        m.get(f"{client.base_url}/categories/tree", payload=tree, headers={"ETag": '"v1"'})
+        m.get(f"{client.base_url}/categories/tree", status=304, headers={"ETag": '"v1"'})
+        assert await client.get_category_tree() == tree
+        client.invalidate_cache('category_tree')
+        assert await client.get_category_tree() == tree
+        requests = m.requests[("GET", URL(f"{client.base_url}/categories/tree"))]
+        assert requests[1].kwargs["headers"]["If-None-Match"] == '"v1"'
+
+@pytest.mark.asyncio
+async def test_list_tests_by_categories(client):
+    response = {"1": [{"id": 10, "category_id": 1, "title": "T", "max_attempts": 3}], "2": []}
+    with aioresponses() as m:
+        m.get(f"{client.base_url}/tests/by-categories?category_id=1&category_id=2", payload=response)
+        result = await client.list_tests_by_categories([2, 1, 2])
+        assert result == {1: response["1"], 2: []}
+
+@pytest.mark.asyncio
+async def test_create_media_bulk_falls_back_to_single_posts(client):
+    items = [
+        {"article_id": 1, "media_type": "png", "url": f"{i}.png", "sort_order": i}
+        for i in range(5)
+    ]
+
+    def echo(url, **kwargs):
+        return CallbackResult(payload={"id": kwargs["json"]["sort_order"] + 100, **kwargs["json"]})
+
+    with aioresponses() as m:
+        m.post(f"{client.base_url}/media/bulk", status=404)
+        m.post(f"{client.base_url}/media", callback=echo, repeat=True)
+        result = await client.create_media_bulk(items)
+        # результаты в порядке входных элементов
+        assert [r["url"] for r in result] == [item["url"] for item in items]
+        assert [r["id"] for r in result] == [100, 101, 102, 103, 104]
+        assert len(m.requests[("POST", URL(f"{client.base_url}/media"))]) == len(items)
+
+@pytest.mark.asyncio
+async def test_create_media_bulk_fallback_failure(client):
+    items = [
+        {"article_id": 1, "media_type": "png", "url": url, "sort_order": i}
+        for i, url in enumerate(["ok.png", "bad.png"])
+    ]
+
+    def create(url, **kwargs):
+        if kwargs["json"]["url"] == "bad.png":
+            return CallbackResult(status=422, reason="Unprocessable Entity")
+        return CallbackResult(payload={"id": 1, **kwargs["json"]})
+
+    with aioresponses() as m:
+        m.post(f"{client.base_url}/media/bulk", status=405)
+        m.post(f"{client.base_url}/media", callback=create, repeat=True)
+        with pytest.raises(aiohttp.ClientResponseError) as exc_info:
+            await client.create_media_bulk(items)
+        assert exc_info.value.status == 422
+
+@pytest.mark.asyncio
+async def test_request_scope_dedupes_gets(client):
+    me_data = {"id": 1, "username": "user1"}
+    with aioresponses() as m:
+        m.get(f"{client.base_url}/auth/me", payload=me_data)
+        m.post(f"{client.base_url}/articles/batch", payload=[{"id": 1, "title": "A"}])
+        with client.request_scope():
+            assert await asyncio.gather(client.me(), client.me()) == [me_data, me_data]
+            # batch-чтение ничего не меняет и не сбрасывает область
+            await client.get_article(1)
+            assert await client.me() == me_data
+        assert len(m.requests[("GET", URL(f"{client.base_url}/auth/me"))]) == 1
+
+@pytest.mark.asyncio
+async def test_request_scope_cleared_by_write(client):
+    me_data = {"id": 1, "username": "user1"}
+    with aioresponses() as m:
+        m.get(f"{client.base_url}/auth/me", payload=me_data)
+        m.delete(f"{client.base_url}/articles/3", status=204)
+        m.get(f"{client.base_url}/auth/me", payload=me_data)
+        with client.request_scope():
+            await client.me()
+            await client.delete_article(3)
+            await client.me()
+        assert len(m.requests[("GET", URL(f"{client.base_url}/auth/me"))]) == 2
+
+@pytest.mark.asyncio
+async def test_use_token_overrides_client_token(client):
+    client.set_token("client-token")
+    with aioresponses() as m:
+        m.get(f"{client.base_url}/auth/me", payload={"id": 1}, repeat=True)
+        client.use_token("context-token")
+        await client.me()
+        client.use_token("")
+        await client.me()
+        requests = m.requests[("GET", URL(f"{client.base_url}/auth/me"))]
+        assert requests[0].kwargs["headers"]["Authorization"] == "Bearer context-token"
+        assert "Authorization" not in requests[1].kwargs["headers"]
+    assert client.token == "client-token"
+
+@pytest.mark.asyncio
+async def test_get_retried_on_server_error(client):
+    client.RETRY_BASE_DELAY = 0
+    with aioresponses() as m:
+        m.get(f"{client.base_url}/auth/me", status=503)
+        m.get(f"{client.base_url}/auth/me", status=502)
+        m.get(f"{client.base_url}/auth/me", payload={"id": 1})
+        assert await client.me() == {"id": 1}
+        assert len(m.requests[("GET", URL(f"{client.base_url}/auth/me"))]) == 3
+
+@pytest.mark.asyncio
+async def test_client_errors_and_writes_not_retried(client):
+    client.RETRY_BASE_DELAY = 0
+    with aioresponses() as m:
+        m.get(f"{client.base_url}/auth/me", status=404)
+        m.post(f"{client.base_url}/articles", status=503)
+        with pytest.raises(aiohttp.ClientResponseError) as exc_info:
+            await client.me()
+        assert exc_info.value.status == 404
+        with pytest.raises(aiohttp.ClientResponseError) as exc_info:
+            await client.create_article(category_id=1, title="T", content="C", content_type="markdown")
+        assert exc_info.value.status == 503
+        assert len(m.requests[("GET", URL(f"{client.base_url}/auth/me"))]) == 1
+        assert len(m.requests[("POST", URL(f"{client.base_url}/articles"))]) == 1
+
+@pytest.mark.asyncio
+async def test_conditional_get_retried_on_server_error(client):
+    client.RETRY_BASE_DELAY = 0
+    tree = [{"id": 1, "title": "Root", "children": []}]
+    with aioresponses() as m:
+        m.get(f"{client.base_url}/categories/tree", status=503)
+        m.get(f"{client.base_url}/categories/tree", payload=tree, headers={"ETag": '"v1"'})
+        assert await client.get_category_tree() == tree
+        assert len(m.requests[("GET", URL(f"{client.base_url}/categories/tree"))]) == 2
+
+@pytest.mark.asyncio
+async def test_retry_after_header_is_used(client):
+    # без Retry-After пришлось бы ждать ~100 секунд
+    client.RETRY_BASE_DELAY = 100
+    with aioresponses() as m:
+        m.get(f"{client.base_url}/auth/me", status=503, headers={"Retry-After": "0"})
+        m.get(f"{client.base_url}/auth/me", payload={"id": 1})
+        assert await asyncio.wait_for(client.me(), timeout=1) == {"id": 1}
+
+def test_retry_delay():
+    client = AsyncApiClient("http://localhost:8083")
+    assert client._retry_delay(0, "2") == 2.0
+    assert client._retry_delay(0, "3600") == client.RETRY_MAX_DELAY
+    for attempt in range(6):
+        base = min(client.RETRY_MAX_DELAY, client.RETRY_BASE_DELAY * 2 ** attempt)
+        assert 0.5 * base <= client._retry_delay(attempt) <= 1.5 * base
+    # не число (HTTP-дата) — обычная экспоненциальная задержка
+    assert client._retry_delay(0, "Wed, 21 Oct 2015 07:28:00 GMT") <= 1.5 * client.RETRY_BASE_DELAY